@@ -0,0 +1,101 @@
+"""Vectorized reporting over order history (needs numpy: pip install numpy).
+
+OrderColumns projects a list of Order objects into flat NumPy arrays once; revenue,
+volume and popularity reports are then group-by/sum operations over those arrays
+instead of per-order Python loops.
+"""
+from datetime import date, timedelta
+
+try:
+    import numpy as np
+
+except ImportError:
+    np = None
+
+MICROSECONDS_PER_DAY = 86_400_000_000
+EPOCH_DATE = date(1970, 1, 1)
+
+class OrderColumns:
+
+    def __init__(self, orders):
+
+        if np is None:
+            raise ImportError("analytics needs numpy (pip install numpy)")
+        count = len(orders)
+        self.timestamp_us = np.fromiter((o.timestamp_us for o in orders), dtype=np.int64, count=count)
+        self.total = np.fromiter((o.total for o in orders), dtype=np.float64, count=count)
+        status_codes = {}
+        self.status = np.fromiter(
+            (status_codes.setdefault(o.status, len(status_codes)) for o in orders), dtype=np.int16, count=count
+        )
+        self.statuses = list(status_codes)
+        # One row per line item, pointing back at its order
+        product_codes = {}
+        item_order, item_product, item_quantity = [], [], []
+        for index, order in enumerate(orders):
+            for product, qty in order.items.items():
+                item_order.append(index)
+                item_product.append(product_codes.setdefault(product, len(product_codes)))
+                item_quantity.append(qty)
+        self.products = list(product_codes)
+        self.item_order = np.array(item_order, dtype=np.int64)
+        self.item_product = np.array(item_product, dtype=np.int32)
+        self.item_quantity = np.array(item_quantity, dtype=np.float64)
+
+    def _status_mask(self, status):
+
+        if status is None:
+            return np.ones(len(self.status), dtype=bool)
+
+        if status not in self.statuses:
+            return np.zeros(len(self.status), dtype=bool)
+        return self.status == self.statuses.index(status)
+
+    def _range_mask(self, start=None, end=None):
+        """Orders placed on day `start` through day `end` (inclusive); open ends are unbounded"""
+        mask = np.ones(len(self.timestamp_us), dtype=bool)
+
+        if start is not None:
+            mask &= self.timestamp_us >= (start - EPOCH_DATE).days * MICROSECONDS_PER_DAY
+
+        if end is not None:
+            mask &= self.timestamp_us < ((end - EPOCH_DATE).days + 1) * MICROSECONDS_PER_DAY
+        return mask
+
+    def revenue(self, start=None, end=None, status="Completed"):
+        mask = self._status_mask(status) & self._range_mask(start, end)
+        return float(self.total[mask].sum())
+
+    def revenue_by_day(self, status="Completed"):
+        """[(date, revenue)] for every day with at least one matching order, oldest first"""
+        mask = self._status_mask(status)
+        days, inverse = np.unique(self.timestamp_us[mask] // MICROSECONDS_PER_DAY, return_inverse=True)
+        sums = np.bincount(inverse, weights=self.total[mask], minlength=len(days))
+        return [(EPOCH_DATE + timedelta(days=int(day)), float(value)) for day, value in zip(days, sums)]
+
+    def orders_by_day(self, status=None):
+        """[(date, order count)] for every day with at least one matching order, oldest first"""
+        mask = self._status_mask(status)
+        days, counts = np.unique(self.timestamp_us[mask] // MICROSECONDS_PER_DAY, return_counts=True)
+        return [(EPOCH_DATE + timedelta(days=int(day)), int(count)) for day, count in zip(days, counts)]
+
+    def product_quantities(self, start=None, end=None, status=None):
+        """Total quantity ordered per product, as {name: quantity}"""
+        order_mask = self._status_mask(status) & self._range_mask(start, end)
+        item_mask = order_mask[self.item_order]
+        sums = np.bincount(
+            self.item_product[item_mask], weights=self.item_quantity[item_mask], minlength=len(self.products)
+        )
+        return {name: float(value) for name, value in zip(self.products, sums) if value}
+
+    def top_products(self, k, start=None, end=None, status=None):
+        quantities = self.product_quantities(start, end, status)
+        names = list(quantities)
+        values = np.fromiter(quantities.values(), dtype=np.float64, count=len(names))
+
+        if k < len(values):
+            best = np.argpartition(-values, k)[:k]
+        else:
+            best = np.arange(len(values))
+        best = best[np.argsort(-values[best], kind="stable")]
+        return [(names[i], float(values[i])) for i in best]
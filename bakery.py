@@ -0,0 +1,823 @@
+"""Bakery data models and BakeryManager, importable without Tk (the GUI lives in main.py)."""
+import math
+import threading
+from contextlib import ExitStack, contextmanager, nullcontext
+from datetime import date, datetime, timedelta
+from inventory import LowStockWatcher
+from recipes import RecipeBook
+from sales import SalesStats
+from storage import COLLECTIONS, open_storage
+RECENT_ORDER_DAYS = 7
+
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+
+class OrderIdGenerator:
+    """Order IDs as YYYYmmddHHMMSS plus a 4-digit sequence within that second.
+
+    IDs only ever increase (a clock that steps back keeps using the last second), and they
+    sort after the plain 14-digit IDs of older orders from the same second.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._second = ""
+        self._sequence = -1
+
+    def advance_past(self, order_id):
+        """Never issue an ID at or below order_id (e.g. the newest ID already on disk)"""
+
+        if not order_id:
+            return
+
+        with self._lock:
+            second, sequence = order_id[:14], int(order_id[14:] or -1)
+
+            if (second, sequence) > (self._second, self._sequence):
+                self._second, self._sequence = second, sequence
+
+    def next_id(self):
+
+        with self._lock:
+            now = datetime.now().strftime("%Y%m%d%H%M%S")
+
+            if now > self._second:
+                self._second, self._sequence = now, 0
+            elif self._sequence < 9999:
+                self._sequence += 1
+            else:
+                # More than 10,000 orders in one second: borrow the next second
+                next_second = datetime.strptime(self._second, "%Y%m%d%H%M%S") + timedelta(seconds=1)
+                self._second, self._sequence = next_second.strftime("%Y%m%d%H%M%S"), 0
+            return f"{self._second}{self._sequence:04d}"
+
+order_ids = OrderIdGenerator()
+
+class Ingredient:
+    __slots__ = ("name", "quantity", "unit", "reorder_level")
+
+    def __init__(self, name, quantity, unit, reorder_level):
+        self.name = name
+        self.quantity = quantity
+        self.unit = unit
+        self.reorder_level = reorder_level
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["name"], data["quantity"], data["unit"], data["reorder_level"])
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "quantity": self.quantity,
+            "unit": self.unit,
+            "reorder_level": self.reorder_level
+        }
+
+class Product:
+    __slots__ = ("name", "price", "recipe", "quantity")
+
+    def __init__(self, name, price, recipe, quantity=0):
+        self.name = name
+        self.price = price
+        self.recipe = recipe
+        self.quantity = quantity
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["name"], data["price"], data["recipe"], data.get("quantity", 0))
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "price": self.price,
+            "recipe": dict(self.recipe),
+            "quantity": self.quantity
+        }
+
+class Order:
+    # The timestamp is kept as integer microseconds since EPOCH (naive local time) instead of a datetime
+    __slots__ = ("order_id", "customer_name", "items", "total", "status", "timestamp_us", "prices")
+
+    def __init__(self, customer_name, items, order_id=None, total=0, status="Pending", timestamp=None, prices=None):
+        self.order_id = order_id if order_id else order_ids.next_id()
+        self.customer_name = customer_name
+        self.items = items
+        self.total = total
+        self.status = status
+        self.timestamp = datetime.fromisoformat(timestamp) if timestamp else datetime.now()
+        # Unit price of each line when it was sold; None (not a dict per order) when none were recorded
+        self.prices = prices if prices else None
+
+    @property
+    def timestamp(self):
+        return EPOCH + self.timestamp_us * MICROSECOND
+
+    @timestamp.setter
+    def timestamp(self, value):
+
+        if value.tzinfo:
+            value = value.astimezone().replace(tzinfo=None)
+        self.timestamp_us = (value - EPOCH) // MICROSECOND
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["customer_name"], data["items"], data["order_id"], data.get("total", 0),
+                   data.get("status", "Pending"), data.get("timestamp"), data.get("prices"))
+
+    def line_revenue(self, product_name, current_price=0):
+        """Revenue of one line at its sale price. Lines saved without one use current_price, which
+        may be a function of the product name so the catalog is only consulted for those lines."""
+
+        if self.prices and product_name in self.prices:
+            price = self.prices[product_name]
+        else:
+            price = current_price(product_name) if callable(current_price) else current_price
+        return price * self.items[product_name]
+
+    def to_dict(self):
+        return {
+            "order_id": self.order_id,
+            "customer_name": self.customer_name,
+            "items": dict(self.items),
+            "total": self.total,
+            "status": self.status,
+            "timestamp": self.timestamp.isoformat(),
+            "prices": dict(self.prices) if self.prices else {}
+        }
+
+class Staff:
+    __slots__ = ("name", "role", "shifts")
+
+    def __init__(self, name, role, shifts):
+        self.name = name
+        self.role = role
+        self.shifts = shifts
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["name"], data["role"], data["shifts"])
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "role": self.role,
+            "shifts": list(self.shifts)
+        }
+
+class BakeryManager:
+    """Bakery state and operations, safe to call from several threads at once.
+
+    Locking is fine-grained: each product's stock has its own lock, each collection has a
+    lock guarding its list, lookup index and saves, and storage calls are serialized by a
+    short storage lock. Locks are always taken in the order product locks (sorted by name),
+    then collection locks (in COLLECTIONS order), then the storage lock, so callers cannot
+    deadlock.
+
+    When the storage is shared with other processes, each mutation runs inside shared(): it
+    holds the cross-process locks of the collections it touches, reloads any of them another
+    process saved in the meantime, applies the change and saves before letting go. In that
+    mode the collection locks are taken before the product locks.
+    """
+    MODELS = {"ingredients": Ingredient, "products": Product, "staff": Staff}
+
+    def __init__(self, storage=None):
+        self.storage = storage if storage else open_storage()
+        self._locks = {name: threading.RLock() for name in COLLECTIONS}
+        self._storage_lock = threading.RLock()
+        self._product_locks = {}
+        self._product_locks_guard = threading.Lock()
+        self._dirty_lock = threading.Lock()
+        self._batch = threading.local()
+        # Orders changed inside some thread's batch and not journaled yet (guarded by the orders lock)
+        self._unjournaled = {}
+        self._compaction = None
+        self._archived_on = date.today()  # close() archives; running past midnight does too
+        self._compaction_guard = threading.Lock()
+        self.ingredients = self.load_data("ingredients", Ingredient)
+        self.products = self.load_data("products", Product)
+        self.staff = self.load_data("staff", Staff)
+        # Pending and recent orders load now; older completed history is read on first use of self.orders
+        self._history_cutoff = (datetime.now() - timedelta(days=RECENT_ORDER_DAYS)).isoformat()
+        self._orders = [Order.from_dict(item) for item in self.storage.load_recent_orders(self._history_cutoff)]
+        self._history_loaded = False
+        self._sales_stats = None
+        self._recipe_book = None
+        self._dirty = set()
+        self.build_indexes()
+        self.low_stock = LowStockWatcher(self.ingredients)
+        order_ids.advance_past(self.storage.last_order_id())
+
+    def load_data(self, collection, cls):
+        return [cls.from_dict(item) for item in self.storage.load(collection)]
+
+    @contextmanager
+    def locked(self, *collections):
+        """Hold the locks of the named collections, taken in COLLECTIONS order"""
+        with ExitStack() as stack:
+            for name in COLLECTIONS:
+
+                if name in collections:
+                    stack.enter_context(self._locks[name])
+            yield
+
+    @contextmanager
+    def shared(self, *collections):
+        """Hold the collections' cross-process locks, first catching up on changes other processes saved"""
+
+        if not self.storage.shared:
+            yield
+            return
+
+        with self.locked(*collections), self.file_locks(*collections):
+            for name in COLLECTIONS:
+
+                if name in collections:
+                    self.sync(name)
+            yield
+
+    def file_locks(self, *collections):
+        """The storage's cross-process locks for the collections (nothing unless it is shared)"""
+        return self.storage.locked(*collections) if self.storage.shared else nullcontext()
+
+    def sync(self, collection):
+        """Bring one collection up to date with the files (shared storage; hold its locks)"""
+        with self._storage_lock:
+            stale = self.storage.is_stale(collection)
+            changes = [] if stale or collection != "orders" else self.storage.journal_tail()
+
+        if stale:
+            self.reload(collection)
+        elif changes:
+            self.apply_order_changes(changes)
+
+    def reload(self, collection):
+        """Replace the in-memory copy of a collection with what is on disk"""
+        with self.locked(collection), self._storage_lock:
+
+            if collection == "orders":
+                self._orders = [Order.from_dict(item) for item in self.storage.load_recent_orders(self._history_cutoff)]
+                self._history_loaded = False
+                self._sales_stats = None
+                order_ids.advance_past(self.storage.last_order_id())
+            else:
+                setattr(self, collection, self.load_data(collection, self.MODELS[collection]))
+            self.build_indexes(collection)
+
+            if collection == "ingredients":
+                self.low_stock.reset(self.ingredients)
+
+    def apply_order_changes(self, changes):
+        """Apply ("put", record) / ("delete", order_id) changes journaled by another process"""
+        with self._locks["orders"]:
+            for op, value in changes:
+                order_id = value["order_id"] if op == "put" else value
+                existing = self._find_order(order_id)
+
+                if existing:
+                    self._untrack(existing)
+
+                if op == "delete":
+
+                    if existing:
+                        self._orders.remove(existing)
+                        del self._orders_by_id[order_id]
+                    continue
+                order = Order.from_dict(value)
+
+                if existing:
+                    # Update in place so views holding the Order see the change
+                    for field in Order.__slots__:
+                        setattr(existing, field, getattr(order, field))
+                    order = existing
+                else:
+                    self._orders.append(order)
+                    self._orders_by_id[order_id] = order
+                self._track(order)
+                order_ids.advance_past(order_id)
+
+    @contextmanager
+    def product_locks(self, names):
+        """Hold the stock locks of several products, taken in name order"""
+        with self._product_locks_guard:
+            locks = [self._product_locks.setdefault(name, threading.Lock()) for name in sorted(set(names))]
+        with ExitStack() as stack:
+            for lock in locks:
+                stack.enter_context(lock)
+            yield
+
+    def build_indexes(self, *collections):
+        """Rebuild the name/order_id lookup tables (first match wins, like a linear scan)"""
+        collections = collections or COLLECTIONS
+
+        if "ingredients" in collections:
+            self._ingredients_by_name = {}
+            for ingredient in self.ingredients:
+                self._ingredients_by_name.setdefault(ingredient.name, ingredient)
+
+        if "products" in collections:
+            self._products_by_name = {}
+            for product in self.products:
+                self._products_by_name.setdefault(product.name, product)
+
+        if "orders" in collections:
+            self._orders_by_id = {}
+            for order in self._orders:
+                self._orders_by_id.setdefault(order.order_id, order)
+        self._recipe_book = None
+
+    @property
+    def recipe_book(self):
+        """Recipes compiled against the ingredient list; rebuilt after ingredients or products change"""
+        book = self._recipe_book
+
+        if book is None:
+            with self.locked("ingredients", "products"):
+                book = self._recipe_book = RecipeBook(self.ingredients, self.products)
+        return book
+
+    @property
+    def orders(self):
+        """Every order, oldest first (loads the order history on first access)"""
+
+        if not self._history_loaded:
+            self.load_order_history()
+        return self._orders
+
+    def load_order_history(self):
+        with self._locks["orders"]:
+
+            if self._history_loaded:
+                return
+            with self._storage_lock:
+                history = [Order.from_dict(item) for item in self.storage.load_order_history(self._history_cutoff)]
+
+            if history:
+                for order in history:
+                    self._orders_by_id.setdefault(order.order_id, order)
+                self._orders = sorted(history + self._orders, key=lambda o: o.timestamp_us)
+            # Set last: other threads read self._orders without the lock once this is True
+            self._history_loaded = True
+
+    @property
+    def sales_stats(self):
+        """Running sales aggregates; built once from the full history, then updated per order"""
+
+        if self._sales_stats is None:
+            with self._locks["orders"]:
+
+                if self._sales_stats is None:
+                    self._sales_stats = SalesStats(self.orders)
+        return self._sales_stats
+
+    def _track(self, order):
+
+        if self._sales_stats is not None:
+            self._sales_stats.add(order)
+
+    def _untrack(self, order):
+
+        if self._sales_stats is not None:
+            self._sales_stats.remove(order)
+
+    def refresh(self, *collections):
+        """Catch up on what other processes saved to the collections (every one when none are
+        named) before reading them; only needed with shared storage, where changes are otherwise
+        picked up only when this process writes the collection"""
+
+        if self.storage.shared:
+            with self.shared(*(collections or COLLECTIONS)):
+                pass
+
+    def pending_orders(self):
+        """Pending orders are always in the recent window, so this never loads the history"""
+        self.refresh("orders")
+        return [order for order in self._orders if order.status == "Pending"]
+
+    def get_ingredient(self, name):
+        self.refresh("ingredients")
+        return self._ingredients_by_name.get(name)
+
+    def get_product(self, name):
+        self.refresh("products")
+        return self._products_by_name.get(name)
+
+    def get_order(self, order_id):
+        self.refresh("orders")
+        return self._find_order(order_id)
+
+    def _find_order(self, order_id):
+        """get_order() without the refresh, for callers already inside shared("orders")"""
+        order = self._orders_by_id.get(order_id)
+
+        if not order and not self._history_loaded:
+            self.load_order_history()
+            order = self._orders_by_id.get(order_id)
+        return order
+
+    @contextmanager
+    def batch(self):
+        """Group commit: the order journal writes and saves this thread makes inside the block
+        are collected and written once when it ends. A no-op with shared storage, which has to
+        save each change before releasing its lock.
+
+        The batch's stock changes are visible to other threads at once, so any save of the
+        products (from whichever thread) first journals the orders batches are holding back;
+        products.json never has stock taken by orders that are not on disk."""
+
+        if self.storage.shared or getattr(self._batch, "active", False):
+            yield
+            return
+        self._batch.active = True
+        self._batch.orders = {}
+        self._batch.collections = set()
+
+        try:
+            yield
+
+        finally:
+            self._batch.active = False
+            self._journal_pending(self._batch.orders)
+
+            if self._batch.collections:
+                self.save_data(*self._batch.collections)
+
+    def journal_orders(self, orders):
+        """Persist new or edited orders without rewriting the whole history"""
+
+        if getattr(self._batch, "active", False):
+            # Journaled at the end of the batch (or before a products save), in their state at that point
+            with self._locks["orders"]:
+                for order in orders:
+                    self._batch.orders[order.order_id] = order
+                    self._unjournaled[order.order_id] = order
+            return
+        self._write_journal(orders)
+
+    def _journal_pending(self, order_ids=None):
+        """Journal the orders batches are holding back: those in order_ids, or all of them"""
+        with self._locks["orders"]:
+
+            if order_ids is None:
+                pending, self._unjournaled = list(self._unjournaled.values()), {}
+            else:
+                pending = [self._unjournaled.pop(i) for i in order_ids if i in self._unjournaled]
+            self._write_journal(pending)
+
+    def _write_journal(self, orders):
+
+        if not orders:
+            return
+        with self._locks["orders"], self.file_locks("orders"):
+            records = [order.to_dict() for order in orders]
+            with self._storage_lock:
+                self.storage.put_orders(records)
+                compact = self.storage.compact_due
+
+            if compact:
+                self.compact_in_background()
+
+    def update_order(self, *orders):
+        """Persist in-place edits (status, items, total) of existing orders"""
+        self.journal_orders(orders)
+
+    def delete_order(self, order_id):
+        with self._locks["orders"], self.shared("orders"):
+
+            if not self._find_order(order_id):
+                return False
+            order = self._orders_by_id.pop(order_id)
+            self._orders.remove(order)
+            self._untrack(order)
+            # Journal the batches' held-back puts first so the delete lands after them
+            self._unjournaled.pop(order_id, None)
+            self._journal_pending()
+            with self.file_locks("orders"), self._storage_lock:
+                self.storage.delete_order(order_id)
+                compact = self.storage.compact_due
+
+            if compact:
+                self.compact_in_background()
+        return True
+
+    def add_order_item(self, order, product, quantity):
+        """Add stock of a product to an existing order; False if there is not enough left or the
+        order no longer exists"""
+        with self.shared("products"), self.product_locks([product.name]):
+
+            if self.storage.shared:
+                # The objects the caller holds may have been replaced by a reload
+                product = self._products_by_name.get(product.name)
+
+            if not product or product.quantity < quantity:
+                return False
+            with self._locks["orders"], self.shared("orders"):
+                # Look it up again before taking stock: another thread or till may have deleted it
+                order = self._find_order(order.order_id)
+
+                if not order:
+                    return False
+                before = (dict(order.items), dict(order.prices) if order.prices else None, order.total, order.status)
+                product.quantity -= quantity
+                self._untrack(order)
+
+                try:
+                    previous = order.items.get(product.name, 0)
+
+                    if order.prices is None:
+                        order.prices = {}
+                    # A line topped up at a new price keeps the quantity-weighted average unit price
+                    order.prices[product.name] = (
+                        order.prices.get(product.name, product.price) * previous + product.price * quantity
+                    ) / (previous + quantity)
+                    order.items[product.name] = previous + quantity
+                    order.total += product.price * quantity
+                    order.status = "Updated"
+                    self.update_order(order)
+
+                except BaseException:
+                    # Nothing was journaled: put the stock and the order back as they were
+                    product.quantity += quantity
+                    order.items, order.prices, order.total, order.status = before
+                    raise
+
+                finally:
+                    self._track(order)
+            self.save_data("products")
+        return True
+
+    def remove_order_item(self, order_id, product_name):
+        with self._locks["orders"], self.shared("orders"):
+            order = self._find_order(order_id)
+
+            if not order or product_name not in order.items:
+                return False
+            self._untrack(order)
+            order.total -= order.line_revenue(product_name, self.get_product_price)
+            del order.items[product_name]
+
+            if order.prices:
+                order.prices.pop(product_name, None)
+            self._track(order)
+            self.update_order(order)
+        return True
+
+    def complete_orders(self, order_ids):
+        completed = []
+        with self._locks["orders"], self.shared("orders"):
+            for order_id in order_ids:
+                order = self._find_order(order_id)
+
+                if order and order.status != "Completed":
+                    self._untrack(order)
+                    order.status = "Completed"
+                    self._track(order)
+                    completed.append(order)
+            self.update_order(*completed)
+        return completed
+
+    def compact_orders(self, archive=True):
+        """Fold the order journal back into the orders snapshot; with `archive`, completed orders
+        older than RECENT_ORDER_DAYS also move out to the archive, which a cold start skips.
+        Works on the records on disk, not the Order objects, so it neither loads the order
+        history nor holds the orders lock."""
+        since = (datetime.now() - timedelta(days=RECENT_ORDER_DAYS)).isoformat() if archive else None
+        self.storage.compact_journal(since)
+
+    def compact_in_background(self):
+        """Start compact_orders() on a worker thread unless one is already running. Rewriting
+        the archive means parsing all of it, so that happens once a day at most (and at close)."""
+        with self._compaction_guard:
+
+            if self._compaction is None or not self._compaction.is_alive():
+                archive = self._archived_on != date.today()
+                self._archived_on = date.today()
+                self._compaction = threading.Thread(
+                    target=self.compact_orders, args=(archive,), name="order-compaction", daemon=True
+                )
+                self._compaction.start()
+
+    def flush(self):
+        """Push any writes still queued by a write-behind storage engine to disk"""
+        self.save_data()
+        with self._storage_lock:
+            self.storage.flush()
+
+    def close(self):
+        self.save_data()
+        with self._compaction_guard:
+            compaction = self._compaction
+
+        if compaction:
+            compaction.join()
+
+        if self.storage.journal_size:
+            self.compact_orders()
+        with self._storage_lock:
+            self.storage.close()
+
+    def mark_dirty(self, *collections):
+        """Flag collections (e.g. "orders") as changed since the last save"""
+        for name in collections:
+
+            if name not in COLLECTIONS:
+                raise ValueError(f"Unknown collection: {name}")
+        with self._dirty_lock:
+            self._dirty.update(collections)
+
+    def save_data(self, *collections):
+        """Write only the collections that changed since the last save"""
+        self.mark_dirty(*collections)
+
+        if getattr(self._batch, "active", False):
+            with self._dirty_lock:
+                self._batch.collections.update(collections or self._dirty)
+            return
+        with self._dirty_lock:
+            # Just the named collections (whose locks the caller may hold); everything dirty when none are named
+            names = set(collections) if collections else set(self._dirty)
+            self._dirty -= names
+
+        if not names:
+            return
+        # The snapshot and the write happen under the same locks, so a later save always
+        # writes a later snapshot
+        with self.locked(*names), self.file_locks(*names):
+
+            if "products" in names:
+                self._journal_pending()
+            snapshot = {name: [record.to_dict() for record in getattr(self, name)] for name in names}
+            with self._storage_lock:
+                self.storage.save_all(snapshot)
+
+    def add_ingredient(self, name, quantity, unit, reorder_level):
+        ingredient = Ingredient(name, quantity, unit, reorder_level)
+        with self._locks["ingredients"], self.shared("ingredients"):
+            self.ingredients.append(ingredient)
+            self._ingredients_by_name.setdefault(name, ingredient)
+            self._recipe_book = None
+            self.low_stock.update(ingredient)
+            self.save_data("ingredients")
+
+    @staticmethod
+    def _position(records, record):
+        """Where record is in records: the same object, or after a reload from disk an equal one"""
+        for position, candidate in enumerate(records):
+
+            if candidate is record:
+                return position
+        record = record.to_dict()
+        return next((position for position, candidate in enumerate(records) if candidate.to_dict() == record), None)
+
+    def delete_ingredient(self, ingredient):
+        """Remove an Ingredient taken from self.ingredients; None if it is no longer there"""
+        with self._locks["ingredients"], self.shared("ingredients"):
+            position = self._position(self.ingredients, ingredient)
+
+            if position is None:
+                return None
+            ingredient = self.ingredients.pop(position)
+
+            if self._ingredients_by_name.get(ingredient.name) is ingredient:
+                del self._ingredients_by_name[ingredient.name]
+                duplicate = next((i for i in self.ingredients if i.name == ingredient.name), None)
+
+                if duplicate:
+                    self._ingredients_by_name[ingredient.name] = duplicate
+            self._recipe_book = None
+            self.low_stock.remove(ingredient)
+            self.save_data("ingredients")
+        return ingredient
+
+    def restock_ingredient(self, name, quantity):
+        with self._locks["ingredients"], self.shared("ingredients"):
+            ingredient = self._ingredients_by_name.get(name)
+
+            if not ingredient:
+                return False
+            ingredient.quantity += quantity
+            self.low_stock.update(ingredient)
+            self.save_data("ingredients")
+        return True
+
+    def check_low_stock(self):
+        return self.low_stock.low_stock()
+
+    def add_product(self, name, price, recipe, quantity):
+        product = Product(name, price, recipe, quantity)
+        with self._locks["products"], self.shared("products"):
+            self.products.append(product)
+            self._products_by_name.setdefault(name, product)
+            self._recipe_book = None
+            self.save_data("products")
+
+    def delete_product(self, name):
+        with self._locks["products"], self.shared("products"):
+            self.products = [p for p in self.products if p.name != name]
+            self._products_by_name.pop(name, None)
+            self._recipe_book = None
+            self.save_data("products")
+
+    def production_shortages(self, items):
+        """{ingredient: amount missing} to bake {product name: quantity}; empty when it can all be made"""
+        return self.recipe_book.shortages(items)
+
+    def max_producible(self):
+        """{product name: units that can still be baked from stock}; None when no tracked ingredient limits it"""
+        return self.recipe_book.max_producible()
+
+    def plan_production(self):
+        """Revenue-maximizing (greedy) split of current stock across products: ({name: units}, revenue)"""
+        return self.recipe_book.plan_production()
+
+    def produce_products(self, items):
+        """Bake a batch: consume the recipe ingredients and add the products to stock, all or nothing.
+        False if a product is unknown, a quantity is not a positive number or ingredients run short."""
+
+        if not items or not all(qty > 0 and math.isfinite(qty) for qty in items.values()):
+            # A negative batch would hand its ingredients back and take the products off the shelf
+            return False
+        with self.shared("ingredients", "products"):
+            products = [(self._products_by_name.get(name), qty) for name, qty in items.items()]
+
+            if any(product is None for product, _ in products):
+                return False
+            with self.product_locks(items), self._locks["ingredients"]:
+                recipe_book = self.recipe_book
+
+                if recipe_book.consume(items):
+                    return False
+                self.low_stock.update(*recipe_book.used_ingredients(items))
+                for product, qty in products:
+                    product.quantity += qty
+            self.save_data("ingredients", "products")
+        return True
+
+    def create_order(self, customer_name, items):
+        """Place an order if every line is in stock; returns the new Order, or False"""
+        with self.shared("products"):
+            lines = [(self._products_by_name.get(name), qty) for name, qty in items.items()]
+
+            if any(not product for product, _ in lines):
+                return False
+            # Check and take the stock of every line while holding all of their product locks
+            with self.product_locks(items):
+                for product, qty in lines:
+
+                    if product.quantity < qty:
+                        return False
+                for product, qty in lines:
+                    product.quantity -= qty
+            # Shared storage: the orders sync also moves the ID generator past other tills' orders
+            with self._locks["orders"], self.shared("orders"):
+                order_id = order_ids.next_id()
+
+                while order_id in self._orders_by_id:
+                    order_id = order_ids.next_id()
+                order = Order(customer_name, items, order_id, prices={product.name: product.price for product, _ in lines})
+                order.total = sum(product.price * qty for product, qty in lines)
+                self._orders.append(order)
+                self._orders_by_id.setdefault(order.order_id, order)
+                self._track(order)
+                self.journal_orders([order])
+            self.save_data("products")
+        return order
+
+    def get_product_price(self, product_name):
+        product = self._products_by_name.get(product_name)
+        return product.price if product else 0
+
+    def add_staff(self, name, role, shifts):
+        with self._locks["staff"], self.shared("staff"):
+            self.staff.append(Staff(name, role, shifts))
+            self.save_data("staff")
+
+    def delete_staff(self, member):
+        """Remove a Staff member taken from self.staff; None if they are no longer there"""
+        with self._locks["staff"], self.shared("staff"):
+            position = self._position(self.staff, member)
+
+            if position is None:
+                return None
+            member = self.staff.pop(position)
+            self.save_data("staff")
+        return member
+
+    def generate_sales_report(self, top=10):
+        # The totals and the best sellers are read under the lock that orders update them under
+        with self._locks["orders"]:
+            stats = self.sales_stats
+            return {
+                "total_sales": stats.total_revenue,
+                "total_orders": stats.order_count,
+                "popular_products": self.get_popular_products(top)
+            }
+
+    def get_popular_products(self, limit=None, days=None):
+        """(product, quantity) best sellers first; `limit` keeps the top few, `days` the recent window"""
+        with self._locks["orders"]:
+            stats = self.sales_stats
+
+            if limit is None:
+                limit = len(stats.product_quantities)
+            return stats.top_products(limit, days)
@@ -0,0 +1,56 @@
+"""Per-order Python loops versus the columnar analytics engine for the sales reports.
+
+Run from the repository root: python benchmarks/bench_analytics.py [--sizes 100000 1000000]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analytics import OrderColumns
+from bench_codecs import make_orders
+from bakery import Order
+
+def loop_reports(orders):
+    """The reports the way BakeryManager/BakeryGUI compute them with plain loops"""
+    revenue_by_day = {}
+    product_counts = {}
+    total = 0
+    for order in orders:
+        for product, qty in order.items.items():
+            product_counts[product] = product_counts.get(product, 0) + qty
+
+        if order.status == "Completed":
+            day = order.timestamp.date()
+            revenue_by_day[day] = revenue_by_day.get(day, 0) + order.total
+            total += order.total
+    popular = sorted(product_counts.items(), key=lambda x: x[1], reverse=True)[:5]
+    return total, revenue_by_day, popular
+
+def columnar_reports(columns):
+    return columns.revenue(), columns.revenue_by_day(), columns.top_products(5)
+
+def timed(function, *args):
+    started = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - started, result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    args = parser.parse_args()
+    print(f"{'orders':>9}  {'loops ms':>10}  {'projection ms':>14}  {'columnar ms':>12}  {'speedup':>8}")
+    for size in args.sizes:
+        orders = [Order.from_dict(record) for record in make_orders(size)]
+        loop_seconds, (loop_total, _, loop_popular) = timed(loop_reports, orders)
+        projection_seconds, columns = timed(OrderColumns, orders)
+        columnar_seconds, (total, _, popular) = timed(columnar_reports, columns)
+        assert abs(total - loop_total) < 1e-6 * max(1, loop_total)
+        assert [name for name, _ in popular] == [name for name, _ in loop_popular]
+        print(f"{size:>9}  {loop_seconds * 1000:>10.1f}  {projection_seconds * 1000:>14.1f}  "
+              f"{columnar_seconds * 1000:>12.1f}  {loop_seconds / columnar_seconds:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Order throughput: one save per create_order versus the asyncio writer's group commit.
+
+Run from the repository root: python benchmarks/bench_async.py [--orders 5000] [--producers 50]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bakery import BakeryManager
+from ingest import AsyncBakery
+from stress_orders import PRODUCTS, open_temp_storage
+
+def new_manager(directory):
+    manager = BakeryManager(open_temp_storage(directory))
+    for name in PRODUCTS:
+        manager.add_product(name, 2.5, {}, 10**9)
+    return manager
+
+def direct(manager, orders):
+    for n in range(orders):
+        manager.create_order("direct", {PRODUCTS[n % len(PRODUCTS)]: 1})
+
+async def pipelined(manager, orders, producers):
+
+    async def producer(index, count):
+        for n in range(count):
+            await bakery.create_order(f"producer {index}", {PRODUCTS[(index + n) % len(PRODUCTS)]: 1})
+
+    async with AsyncBakery(manager) as bakery:
+        share = orders // producers
+        await asyncio.gather(*(producer(index, share) for index in range(producers)))
+
+def timed(function, *args):
+    started = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - started
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--orders", type=int, default=5000)
+    parser.add_argument("--producers", type=int, default=50)
+    args = parser.parse_args()
+    orders = args.orders - args.orders % args.producers
+
+    with tempfile.TemporaryDirectory() as first, tempfile.TemporaryDirectory() as second:
+        manager = new_manager(first)
+        direct_seconds = timed(direct, manager, orders)
+        manager.close()
+        manager = new_manager(second)
+        async_seconds = timed(asyncio.run, pipelined(manager, orders, args.producers))
+        placed = len(manager.orders)
+        manager.close()
+    print(f"{orders:,} orders")
+    print(f"  create_order, save per order:   {orders / direct_seconds:10,.0f} orders/s")
+    print(f"  AsyncBakery, {args.producers} producers:     {orders / async_seconds:10,.0f} orders/s  ({placed:,} placed)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Bytes on disk and save latency of orders snapshots for each available codec.
+
+Run from the repository root: python benchmarks/bench_codecs.py [--sizes 10000 100000]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from storage import CODECS, JsonStorage
+
+PRODUCTS = ["Croissant", "Baguette", "Sourdough", "Muffin", "Eclair", "Scone", "Danish", "Bagel"]
+
+def make_orders(count):
+    rng = random.Random(42)
+    start = datetime(2024, 1, 1, 7)
+    orders = []
+    for n in range(count):
+        items = {name: rng.randint(1, 6) for name in rng.sample(PRODUCTS, rng.randint(1, 4))}
+        orders.append({
+            "order_id": f"{n:018d}",
+            "customer_name": f"Customer {rng.randint(1, 5000)}",
+            "items": items,
+            "total": round(sum(qty * 2.5 for qty in items.values()), 2),
+            "status": rng.choice(["Completed", "Completed", "Pending"]),
+            "timestamp": (start + timedelta(minutes=3 * n)).isoformat()
+        })
+    return orders
+
+def time_save(save, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        save()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    print(f"{'orders':>8}  {'codec':<16}{'bytes':>14}{'save ms':>10}")
+    for size in args.sizes:
+        orders = make_orders(size)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            legacy_path = os.path.join(tmp, "legacy.json")
+
+            def save_legacy():
+                with open(legacy_path, "w") as f:
+                    json.dump(orders, f, indent=4)
+            seconds = time_save(save_legacy, args.repeat)
+            print(f"{size:>8}  {'json indent=4':<16}{os.path.getsize(legacy_path):>14,}{seconds * 1000:>10.1f}")
+            for name, (codec, available) in CODECS.items():
+
+                if not available:
+                    print(f"{size:>8}  {name:<16}{'not installed':>14}")
+                    continue
+                files = {"orders": os.path.join(tmp, f"orders-{name}.json")}
+                storage = JsonStorage(files=files, journal_file=os.path.join(tmp, "orders.journal"),
+                                      commit_file=os.path.join(tmp, "bakery.commit"), codec=codec)
+                seconds = time_save(lambda: storage.save("orders", orders), args.repeat)
+                print(f"{size:>8}  {name:<16}{os.path.getsize(storage.files['orders']):>14,}{seconds * 1000:>10.1f}")
+
+if __name__ == "__main__":
+    main()
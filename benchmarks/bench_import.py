@@ -0,0 +1,39 @@
+"""Start-up cost of importing the headless core (bakery) versus the Tk GUI module (main).
+
+Each import runs in a fresh interpreter with bytecode caching on (after one warm-up run),
+and the time of an empty interpreter start is subtracted so only the import is counted.
+
+Run from the repository root: python benchmarks/bench_import.py [--runs 20]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENV = {name: value for name, value in os.environ.items() if name != "PYTHONDONTWRITEBYTECODE"}
+
+def start_time(code, runs):
+    subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=ENV, check=True)
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=ENV, check=True)
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+    check = "import sys; assert 'tkinter' not in sys.modules, 'bakery pulled in tkinter'"
+    subprocess.run([sys.executable, "-c", f"import bakery; {check}"], cwd=ROOT, env=ENV, check=True)
+    baseline = start_time("pass", args.runs)
+    print(f"median of {args.runs} fresh interpreters, interpreter start ({baseline * 1000:.1f} ms) subtracted")
+    for module in ("bakery", "main"):
+        print(f"  import {module:7} {(start_time(f'import {module}', args.runs) - baseline) * 1000:8.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Memory held by loaded order history: the old dict-backed Order versus the slotted one.
+
+Run from the repository root: python benchmarks/bench_memory.py [--orders 100000]
+"""
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_codecs import make_orders
+from bakery import Order
+
+class DictOrder:
+    """Order as it was before __slots__: per-instance __dict__ and a full datetime"""
+
+    def __init__(self, customer_name, items, order_id=None, total=0, status="Pending", timestamp=None):
+        self.order_id = order_id
+        self.customer_name = customer_name
+        self.items = items
+        self.total = total
+        self.status = status
+        self.timestamp = datetime.fromisoformat(timestamp) if timestamp else datetime.now()
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    objects = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return current
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--orders", type=int, default=100_000)
+    args = parser.parse_args()
+    records = make_orders(args.orders)
+    before = measure(lambda: [DictOrder(**record) for record in records])
+    after = measure(lambda: [Order.from_dict(record) for record in records])
+    print(f"{args.orders:,} orders (record objects and timestamps; item dicts are shared with the input)")
+    print(f"  dict-backed Order: {before / 2**20:8.1f} MiB  ({before / args.orders:.0f} B/order)")
+    print(f"  slotted Order:     {after / 2**20:8.1f} MiB  ({after / args.orders:.0f} B/order)")
+    print(f"  saved:             {(before - after) / before:8.1%}")
+
+if __name__ == "__main__":
+    main()
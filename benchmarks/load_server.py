@@ -0,0 +1,89 @@
+"""Sustained order throughput of the HTTP API (server.py) with keep-alive clients.
+
+Starts a BakeryServer on a free port over throw-away data files (or targets --url), then
+has every client thread post orders over one persistent connection for --seconds, either
+one order per request or --batch orders per request.
+
+Run from the repository root: python benchmarks/load_server.py [--clients 8] [--seconds 10] [--batch 1]
+"""
+import argparse
+import http.client
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bakery import BakeryManager
+from server import BakeryServer
+from stress_orders import PRODUCTS, open_temp_storage
+
+def client(host, port, seconds, batch, counts, index):
+    connection = http.client.HTTPConnection(host, port)
+    orders = [{"customer_name": f"load {index}", "items": {PRODUCTS[(index + n) % len(PRODUCTS)]: 1}} for n in range(batch)]
+    body = json.dumps(orders[0] if batch == 1 else orders)
+    placed = requests = 0
+    deadline = time.perf_counter() + seconds
+
+    while time.perf_counter() < deadline:
+        connection.request("POST", "/orders", body, {"Content-Type": "application/json"})
+        response = connection.getresponse()
+        payload = json.loads(response.read())
+        requests += 1
+
+        if response.status == 201:
+            placed += 1
+        elif response.status == 207:
+            placed += sum(1 for result in payload if result["code"] == 201)
+    connection.close()
+    counts[index] = (requests, placed)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--batch", type=int, default=1, help="orders per request")
+    parser.add_argument("--url", help="an already running server (e.g. http://127.0.0.1:8080)")
+    args = parser.parse_args()
+    directory = server = None
+
+    if args.url:
+        url = urlsplit(args.url)
+        host, port = url.hostname, url.port or 80
+    else:
+        directory = tempfile.TemporaryDirectory()
+        manager = BakeryManager(open_temp_storage(directory.name))
+        for name in PRODUCTS:
+            manager.add_product(name, 2.5, {}, 10**9)
+        server = BakeryServer(("127.0.0.1", 0), manager, quiet=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        host, port = server.server_address
+    counts = [None] * args.clients
+    threads = [
+        threading.Thread(target=client, args=(host, port, args.seconds, args.batch, counts, index))
+        for index in range(args.clients)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    requests = sum(count[0] for count in counts)
+    placed = sum(count[1] for count in counts)
+    print(f"{args.clients} keep-alive clients, {args.batch} order(s) per request, {elapsed:.1f}s")
+    print(f"  {requests / elapsed:10,.0f} requests/s")
+    print(f"  {placed / elapsed:10,.0f} orders/s  ({placed:,} placed)")
+
+    if server:
+        server.shutdown()
+        server.server_close()
+        server.manager.close()
+        directory.cleanup()
+
+if __name__ == "__main__":
+    main()
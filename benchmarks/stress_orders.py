@@ -0,0 +1,94 @@
+"""Many threads placing orders against one BakeryManager: stock must never oversell.
+
+Every worker repeatedly orders random products until the shelves are empty. At the end the
+script checks that no product went negative, that every unit taken from stock belongs to
+exactly one saved order, and that a fresh manager reads the same state back from disk.
+
+Run from the repository root: python benchmarks/stress_orders.py [--threads 16] [--stock 500]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bakery import BakeryManager
+from storage import COLLECTION_FILES, JsonStorage
+
+PRODUCTS = ["bread", "croissant", "muffin", "bagel", "scone", "donut"]
+
+def open_temp_storage(directory):
+    files = {name: os.path.join(directory, path) for name, path in COLLECTION_FILES.items()}
+    return JsonStorage(files, os.path.join(directory, "orders.journal"), os.path.join(directory, "bakery.commit"))
+
+def worker(manager, seed, placed):
+    rng = random.Random(seed)
+    failures = 0
+    # Stop after a run of refusals: by then the stock is (nearly) gone
+    while failures < 50:
+        items = {name: rng.randint(1, 3) for name in rng.sample(PRODUCTS, rng.randint(1, 3))}
+
+        if manager.create_order(f"customer {seed}", items):
+            placed.append(items)
+            failures = 0
+        else:
+            failures += 1
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--stock", type=int, default=500, help="starting units of each product")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        manager = BakeryManager(open_temp_storage(directory))
+        for name in PRODUCTS:
+            manager.add_product(name, 2.5, {}, args.stock)
+        placed = []
+        threads = [threading.Thread(target=worker, args=(manager, seed, placed)) for seed in range(args.threads)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        manager.close()
+
+        sold = {name: 0 for name in PRODUCTS}
+        for items in placed:
+            for name, qty in items.items():
+                sold[name] += qty
+        reloaded = BakeryManager(open_temp_storage(directory))
+        problems = []
+        for name in PRODUCTS:
+            product = manager.get_product(name)
+
+            if product.quantity < 0:
+                problems.append(f"{name} oversold: stock is {product.quantity}")
+
+            if product.quantity + sold[name] != args.stock:
+                problems.append(f"{name}: {sold[name]} sold + {product.quantity} left != {args.stock}")
+
+            if reloaded.get_product(name).quantity != product.quantity:
+                problems.append(f"{name}: saved stock {reloaded.get_product(name).quantity} != {product.quantity}")
+
+        if len(reloaded.orders) != len(placed):
+            problems.append(f"{len(reloaded.orders)} orders saved, {len(placed)} placed")
+        reloaded.close()
+
+    print(f"{args.threads} threads placed {len(placed):,} orders in {elapsed:.2f}s")
+    print("  remaining stock: " + ", ".join(f"{name}={manager.get_product(name).quantity}" for name in PRODUCTS))
+
+    if problems:
+        print("FAILED")
+        for problem in problems:
+            print(f"  {problem}")
+        sys.exit(1)
+    print("  OK: no product oversold, every unit sold is in exactly one saved order")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""asyncio facade over BakeryManager with a single writer and group commit.
+
+Any number of coroutines (the HTTP API, a barcode scanner loop, a bulk importer) submit
+operations to one queue. A single writer task takes everything queued so far (up to
+max_batch operations), applies it in submission order on a worker thread inside
+BakeryManager.batch(), and resolves each caller's future only after the whole batch has
+been written. One journal append and one save then cover a whole batch instead of one
+each per order.
+
+    async with AsyncBakery(manager) as bakery:
+        order = await bakery.create_order("Ann", {"Croissant": 2})
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from bakery import BakeryManager
+
+MAX_BATCH = 500
+
+class AsyncBakery:
+
+    def __init__(self, manager=None, max_batch=MAX_BATCH):
+        self.manager = manager if manager else BakeryManager()
+        self.max_batch = max_batch
+        self._queue = None
+        self._writer = None
+        self._executor = None
+        self._closed = False
+
+    async def start(self):
+
+        if self._writer is None:
+            self._closed = False
+            self._queue = asyncio.Queue()
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="bakery-writer")
+            self._writer = asyncio.create_task(self._run())
+
+    async def close(self):
+        """Finish everything already submitted, then stop the writer"""
+
+        writer = self._writer
+
+        if writer is None:
+            return
+
+        if not self._closed:
+            # Refuse new submits first: anything queued behind the None would never run
+            self._closed = True
+            await self._queue.put(None)
+        await writer
+
+        if self._writer is writer:
+            self._executor.shutdown()
+            self._writer = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def submit(self, method, *args):
+        """Queue BakeryManager.<method>(*args); returns a future for its result (call from the event loop)"""
+
+        if self._writer is None or self._closed or self._writer.done():
+            raise RuntimeError("AsyncBakery is not running; use 'async with' or await start()")
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((getattr(self.manager, method), args, future))
+        return future
+
+    async def create_order(self, customer_name, items):
+        return await self.submit("create_order", customer_name, items)
+
+    async def restock(self, name, quantity):
+        return await self.submit("restock_ingredient", name, quantity)
+
+    async def complete_orders(self, order_ids):
+        return await self.submit("complete_orders", list(order_ids))
+
+    async def produce(self, items):
+        return await self.submit("produce_products", items)
+
+    async def _run(self):
+
+        try:
+            await self._write_batches()
+
+        finally:
+            # Whatever is still queued will never be applied (the writer stopped or was cancelled)
+            while not self._queue.empty():
+                job = self._queue.get_nowait()
+
+                if job is not None and not job[2].done():
+                    job[2].set_exception(RuntimeError("AsyncBakery stopped before this operation ran"))
+
+    async def _write_batches(self):
+        loop = asyncio.get_running_loop()
+        stopping = False
+
+        while not stopping:
+            job = await self._queue.get()
+
+            if job is None:
+                break
+            jobs = [job]
+            # Everything that queued up while the previous batch was being written goes in this one
+            while len(jobs) < self.max_batch and not self._queue.empty():
+                job = self._queue.get_nowait()
+
+                if job is None:
+                    stopping = True
+                    break
+                jobs.append(job)
+            results = await loop.run_in_executor(self._executor, self._apply, jobs)
+            for (_, _, future), (error, value) in zip(jobs, results):
+
+                if future.cancelled():
+                    continue
+
+                if error:
+                    future.set_exception(value)
+                else:
+                    future.set_result(value)
+
+    def _apply(self, jobs):
+        """Run a batch on the writer thread; returns (failed, result or exception) per job"""
+        results = []
+
+        try:
+
+            with self.manager.batch():
+                for method, args, _ in jobs:
+
+                    try:
+                        results.append((False, method(*args)))
+
+                    except Exception as e:
+                        results.append((True, e))
+
+        except Exception as e:
+            # The group commit itself failed, so none of the batch is known to be on disk
+            return [(True, e)] * len(jobs)
+        return results
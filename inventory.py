@@ -0,0 +1,57 @@
+class LowStockWatcher:
+    """The set of ingredients below their reorder level, updated one ingredient at a time.
+
+    Callers report each ingredient whose quantity or reorder level changed through update()
+    (or remove() when it is deleted); subscribers are called with the current low-stock list
+    whenever an ingredient enters or leaves the set.
+    """
+
+    def __init__(self, ingredients=()):
+        self._low = {}
+        self._subscribers = []
+        for ingredient in ingredients:
+
+            if ingredient.quantity < ingredient.reorder_level:
+                self._low[id(ingredient)] = ingredient
+
+    def reset(self, ingredients):
+        """Start over from a freshly loaded ingredient list"""
+        self._low = {id(i): i for i in ingredients if i.quantity < i.reorder_level}
+        self._notify()
+
+    def low_stock(self):
+        return list(self._low.values())
+
+    def __len__(self):
+        return len(self._low)
+
+    def subscribe(self, callback):
+        """Call callback(low_stock_list) on every change; returns a function that unsubscribes"""
+        self._subscribers.append(callback)
+        return lambda: self._subscribers.remove(callback)
+
+    def _notify(self):
+        low = self.low_stock()
+        for callback in list(self._subscribers):
+            callback(low)
+
+    def update(self, *ingredients):
+        changed = False
+        for ingredient in ingredients:
+            key = id(ingredient)
+            is_low = ingredient.quantity < ingredient.reorder_level
+
+            if is_low and key not in self._low:
+                self._low[key] = ingredient
+                changed = True
+            elif not is_low and key in self._low:
+                del self._low[key]
+                changed = True
+
+        if changed:
+            self._notify()
+
+    def remove(self, ingredient):
+
+        if self._low.pop(id(ingredient), None) is not None:
+            self._notify()
@@ -3,13 +3,11 @@ import os
 import sys
 import tkinter as tk
 from tkinter import ttk, messagebox
-import json
 from datetime import datetime
-INGREDIENTS_FILE = "ingredients.json"
-PRODUCTS_FILE = "products.json"
-ORDERS_FILE = "orders.json"
-STAFF_FILE = "staff.json"
+from bakery import BakeryManager
+from storage import StorageError
 WINDOW_STATE_FILE = "window_state.json"
+LOAD_CHUNK_SIZE = 200
 
 def resource_path(relative_path):
     """ Get absolute path to resources for both dev and PyInstaller """
@@ -29,164 +27,6 @@ def resource_path(relative_path):
         raise FileNotFoundError(f"Resource not found: {full_path}")
     return full_path
 
-class Ingredient:
-
-    def __init__(self, name, quantity, unit, reorder_level):
-        self.name = name
-        self.quantity = quantity
-        self.unit = unit
-        self.reorder_level = reorder_level
-
-    def to_dict(self):
-        return {
-            "name": self.name,
-            "quantity": self.quantity,
-            "unit": self.unit,
-            "reorder_level": self.reorder_level
-        }
-
-class Product:
-
-    def __init__(self, name, price, recipe, quantity=0):
-        self.name = name
-        self.price = price
-        self.recipe = recipe
-        self.quantity = quantity
-
-    def to_dict(self):
-        return {
-            "name": self.name,
-            "price": self.price,
-            "recipe": self.recipe,
-            "quantity": self.quantity
-        }
-
-class Order:
-
-    def __init__(self, customer_name, items, order_id=None, total=0, status="Pending", timestamp=None):
-        self.order_id = order_id if order_id else datetime.now().strftime("%Y%m%d%H%M%S")
-        self.customer_name = customer_name
-        self.items = items
-        self.total = total
-        self.status = status
-        self.timestamp = datetime.fromisoformat(timestamp) if timestamp else datetime.now()
-
-    def to_dict(self):
-        return {
-            "order_id": self.order_id,
-            "customer_name": self.customer_name,
-            "items": self.items,
-            "total": self.total,
-            "status": self.status,
-            "timestamp": self.timestamp.isoformat()
-        }
-
-class Staff:
-
-    def __init__(self, name, role, shifts):
-        self.name = name
-        self.role = role
-        self.shifts = shifts
-
-    def to_dict(self):
-        return {
-            "name": self.name,
-            "role": self.role,
-            "shifts": self.shifts
-        }
-
-class BakeryManager:
-
-    def __init__(self):
-        self.ingredients = self.load_data(INGREDIENTS_FILE, Ingredient)
-        self.products = self.load_data(PRODUCTS_FILE, Product)
-        self.orders = self.load_data(ORDERS_FILE, Order)
-        self.staff = self.load_data(STAFF_FILE, Staff)
-    @staticmethod
-
-    def load_data(file, cls):
-
-        try:
-
-            with open(file, "r") as f:
-                data = json.load(f)
-                return [cls(**item) for item in data]
-
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-
-    def save_data(self):
-
-        with open(INGREDIENTS_FILE, "w") as f:
-            json.dump([i.to_dict() for i in self.ingredients], f, indent=4)
-
-        with open(PRODUCTS_FILE, "w") as f:
-            json.dump([p.to_dict() for p in self.products], f, indent=4)
-
-        with open(ORDERS_FILE, "w") as f:
-            json.dump([o.to_dict() for o in self.orders], f, indent=4)
-
-        with open(STAFF_FILE, "w") as f:
-            json.dump([s.to_dict() for s in self.staff], f, indent=4)
-
-    def add_ingredient(self, name, quantity, unit, reorder_level):
-        self.ingredients.append(Ingredient(name, quantity, unit, reorder_level))
-        self.save_data()
-
-    def restock_ingredient(self, name, quantity):
-        for ingredient in self.ingredients:
-
-            if ingredient.name == name:
-                ingredient.quantity += quantity
-                self.save_data()
-                return True
-        return False
-
-    def check_low_stock(self):
-        return [ing for ing in self.ingredients if ing.quantity < ing.reorder_level]
-
-    def add_product(self, name, price, recipe, quantity):
-        self.products.append(Product(name, price, recipe, quantity))
-        self.save_data()
-
-    def create_order(self, customer_name, items):
-        for product_name, qty in items.items():
-            product = next((p for p in self.products if p.name == product_name), None)
-
-            if not product or product.quantity < qty:
-                return False
-        for product_name, qty in items.items():
-            product = next(p for p in self.products if p.name == product_name)
-            product.quantity -= qty
-        order = Order(customer_name, items)
-        order.total = sum(self.get_product_price(name) * qty for name, qty in items.items())
-        self.orders.append(order)
-        self.save_data()
-        return True
-
-    def get_product_price(self, product_name):
-        product = next((p for p in self.products if p.name == product_name), None)
-        return product.price if product else 0
-
-    def add_staff(self, name, role, shifts):
-        self.staff.append(Staff(name, role, shifts))
-        self.save_data()
-
-    def generate_sales_report(self):
-        total_sales = sum(order.total for order in self.orders if order.status == "Completed")
-        return {
-            "total_sales": total_sales,
-            "total_orders": len(self.orders),
-            "popular_products": self.get_popular_products()
-        }
-
-    def get_popular_products(self):
-        product_counts = {}
-        for order in self.orders:
-            for product, qty in order.items.items():
-                product_counts[product] = product_counts.get(product, 0) + qty
-        return sorted(product_counts.items(), key=lambda x: x[1], reverse=True)
-
 class PlaceholderEntry(ttk.Entry):
 
     def __init__(self, master=None, placeholder="", *args, **kwargs):
@@ -214,11 +54,91 @@ class PlaceholderEntry(ttk.Entry):
         value = self.get().strip()
         return "" if value == self.placeholder else value
 
+class PagedTreeview(ttk.Treeview):
+    """Treeview that materializes its rows a page at a time.
+
+    set_rows() takes any iterable of records and a function turning one record into the
+    row's values (and optionally one giving its tags). Only the first page is inserted
+    up front; the next page is inserted whenever the view is scrolled close to the last
+    materialized row. A footer row, if given, always stays at the bottom.
+    """
+    PAGE_SIZE = 200
+
+    def __init__(self, master=None, page_size=PAGE_SIZE, **kwargs):
+        self.page_size = page_size
+        self._records = iter(())
+        self._row = self._tags = None
+        self._loaded = 0
+        self._exhausted = True
+        self._pending = None
+        self._yscrollcommand = None
+        super().__init__(master, **kwargs)
+
+    def configure(self, cnf=None, **kwargs):
+
+        if "yscrollcommand" in kwargs:
+            self._yscrollcommand = kwargs["yscrollcommand"]
+            kwargs["yscrollcommand"] = self._on_yscroll
+        return super().configure(cnf, **kwargs)
+
+    config = configure
+
+    def set_rows(self, records, row, tags=None, footer=None):
+        self.delete(*self.get_children())
+        self._records = iter(records)
+        self._row, self._tags = row, tags
+        self._loaded = 0
+        self._exhausted = False
+
+        if footer is not None:
+            self.insert("", "end", **footer)
+        self.load_more()
+
+    def load_more(self):
+        self._pending = None
+        if self._exhausted:
+            return
+        count = 0
+        for record in self._records:
+            options = {"values": self._row(record)}
+
+            if self._tags is not None:
+                options["tags"] = self._tags(record)
+            self.insert("", self._loaded, **options)
+            self._loaded += 1
+            count += 1
+
+            if count >= self.page_size:
+                break
+        else:
+            self._exhausted = True
+
+    def _on_yscroll(self, first, last):
+
+        if self._yscrollcommand is not None:
+            self._yscrollcommand(first, last)
+
+        if self._exhausted or self._pending is not None or not self._loaded:
+            return
+        # Fetch the next page once fewer than half a page of rows is left below the view
+        visible_end = float(last) * len(self.get_children())
+
+        if visible_end >= self._loaded - self.page_size // 2:
+            self._pending = self.after_idle(self.load_more)
+
+    def destroy(self):
+
+        if self._pending is not None:
+            self.after_cancel(self._pending)
+            self._pending = None
+        super().destroy()
+
 class BakeryGUI:
 
     def __init__(self, master):
         self.master = master
         self.manager = BakeryManager()
+        self._loading = None
         master.title("Bakery Management System")
         window_icon_path = resource_path(r"icons\icon.ico")
         self.master.iconbitmap(window_icon_path)
@@ -246,12 +166,45 @@ class BakeryGUI:
         self.style.configure('TEntry', font=('Arial', 10), padding=5)
         self.main_frame = ttk.Frame(master)
         self.main_frame.pack(fill='both', expand=True)
+        self.low_stock_badge = ttk.Label(self.main_frame, foreground='white', background='#c62828',
+                                         font=('Arial', 11, 'bold'), anchor='center', padding=4)
+        self.storage_badge = ttk.Label(self.main_frame, foreground='white', background='#c62828',
+                                       font=('Arial', 11, 'bold'), anchor='center', padding=4)
         self.content_frame = ttk.Frame(self.main_frame)
         self.content_frame.pack(fill='both', expand=True, padx=20, pady=20)
+        self.manager.low_stock.subscribe(
+            lambda low: self.master.after(0, self.update_low_stock_badge)
+        )
+        self.update_low_stock_badge()
+
+        if hasattr(self.manager.storage, "on_error"):
+            # Write-behind storage saves on its own thread; a failure there would otherwise go unnoticed
+            self.manager.storage.on_error = lambda error: self.master.after(0, self.update_storage_badge)
         self.create_main_menu()
         self.load_window_geometry()
         master.protocol("WM_DELETE_WINDOW", self.on_close)
 
+    def update_low_stock_badge(self):
+        """Show or hide the low-stock banner above the content area"""
+        low = self.manager.check_low_stock()
+
+        if low:
+            names = ", ".join(ing.name for ing in low[:5]) + (", ..." if len(low) > 5 else "")
+            self.low_stock_badge.config(text=f"⚠ {len(low)} ingredient(s) low on stock: {names}")
+            self.low_stock_badge.pack(fill='x', before=self.content_frame)
+        else:
+            self.low_stock_badge.pack_forget()
+
+    def update_storage_badge(self):
+        """Show or hide the banner warning that background saves are failing"""
+        error = self.manager.storage.error
+
+        if error:
+            self.storage_badge.config(text=f"⚠ Changes are not being saved, retrying: {error}")
+            self.storage_badge.pack(fill='x', before=self.content_frame)
+        else:
+            self.storage_badge.pack_forget()
+
     def load_window_geometry(self):
 
         if os.path.exists(self.config_file):
@@ -274,6 +227,7 @@ class BakeryGUI:
 
     def save_window_geometry(self):
         config = configparser.ConfigParser()
+        config.read(self.config_file)
         config["Geometry"] = {
             "size": self.master.geometry(),
             "state": self.master.state()
@@ -285,6 +239,28 @@ class BakeryGUI:
     def on_close(self):
         """Handle window close event"""
         self.save_window_geometry()
+
+        while True:
+
+            try:
+                self.manager.flush()
+                self.manager.close()
+                break
+
+            except Exception as e:
+                # Write-behind saves re-raise whatever the disk reported (OSError etc.); don't let it escape Tk
+                choice = messagebox.askyesnocancel(
+                    "Save Error",
+                    f"The latest changes could not be saved:\n{e}\n\n"
+                    "Yes: try again\nNo: quit without them\nCancel: keep the window open",
+                    parent=self.master
+                )
+
+                if choice is None:
+                    return
+
+                if not choice:
+                    break
         self.master.destroy()
 
     def create_main_menu(self):
@@ -304,11 +280,51 @@ class BakeryGUI:
 
     def clear_content(self):
         """Clears only the dynamic content area"""
+        self.cancel_loading()
 
         if self.content_frame.winfo_exists():
             for widget in self.content_frame.winfo_children():
                 widget.destroy()
 
+    def cancel_loading(self):
+
+        if self._loading is not None:
+            self.master.after_cancel(self._loading)
+            self._loading = None
+
+    def populate_tree(self, tree, records, row, tags=None, chunk_size=LOAD_CHUNK_SIZE):
+        """Insert one row per record in chunks scheduled with after(), keeping the window responsive
+
+        A progress bar is shown below the table while rows are still being added. The load
+        is cancelled when the content area is cleared.
+        """
+        self.cancel_loading()
+        records = list(records)
+        progress = None
+
+        if len(records) > chunk_size:
+            progress = ttk.Progressbar(self.content_frame, mode='determinate', maximum=len(records))
+            progress.pack(fill='x', padx=20, pady=(0, 5))
+        position = 0
+
+        def insert_chunk():
+            nonlocal position
+            self._loading = None
+            for record in records[position:position + chunk_size]:
+                options = {"values": row(record)}
+
+                if tags is not None:
+                    options["tags"] = tags(record)
+                tree.insert("", "end", **options)
+            position += chunk_size
+
+            if position < len(records):
+                progress['value'] = position
+                self._loading = self.master.after(1, insert_chunk)
+            elif progress is not None:
+                progress.destroy()
+        insert_chunk()
+
     def inventory_management(self):
         self.clear_content()
         ttk.Label(self.content_frame, text="Inventory Management", style='Header.TLabel').pack(pady=10)
@@ -388,31 +404,38 @@ class BakeryGUI:
 
     def view_products(self):
         self.clear_content()
+        self.manager.refresh("ingredients", "products")
         ttk.Label(self.content_frame, text="Products", style='Header.TLabel').pack(pady=10)
         container = ttk.Frame(self.content_frame)
         container.pack(fill='both', expand=True)
         tree_frame = ttk.Frame(container)
         tree_frame.place(relx=0.5, rely=0.4, anchor='center')
-        tree = ttk.Treeview(tree_frame, columns=("Product", "Price","Quantity", "Recipe", 'Action'), show='headings', height=12)
+        tree = ttk.Treeview(tree_frame, columns=("Product", "Price","Quantity", "Can Bake", "Recipe", 'Action'), show='headings', height=12)
         tree.column("Product", width=200, anchor='center', minwidth=50)
         tree.column("Price", width=100, anchor='center', minwidth=80)
         tree.column("Quantity", width=100, anchor='center', minwidth=80)
+        tree.column("Can Bake", width=100, anchor='center', minwidth=80)
         tree.column("Recipe", width=450, anchor='center', minwidth=100)
         tree.column("Action", width=100, anchor='center', minwidth=80)
         tree.heading("Product", text="Product Name")
         tree.heading("Price", text="Price")
         tree.heading("Quantity", text="Quantity")
+        tree.heading("Can Bake", text="Can Bake")
         tree.heading("Recipe", text="Recipe Requirements")
         tree.heading("Action", text="Action")
-        for product in self.manager.products:
-            recipe_str = ", ".join([f"{ing}: {qty}" for ing, qty in product.recipe.items()])
-            tree.insert("", "end", values=(
+        producible = self.manager.max_producible()
+
+        def product_row(product):
+            can_bake = producible.get(product.name)
+            return (
                 product.name,
                 f"${product.price:.2f}",
                 product.quantity,
-                recipe_str,
+                "∞" if can_bake is None else can_bake,
+                ", ".join([f"{ing}: {qty}" for ing, qty in product.recipe.items()]),
                 "❌ Delete"
-            ))
+            )
+        self.populate_tree(tree, self.manager.products, product_row)
 
         def on_tree_click(event):
             region = tree.identify("region", event.x, event.y)
@@ -421,7 +444,7 @@ class BakeryGUI:
                 column = tree.identify_column(event.x)
                 item = tree.identify_row(event.y)
 
-                if column == "#5":  # Action column
+                if column == "#6":  # Action column
                     product_name = tree.item(item, "values")[0]
                     delete_product(product_name)
         tree.bind("<Button-1>", on_tree_click)
@@ -430,8 +453,7 @@ class BakeryGUI:
             confirm = messagebox.askyesno("Confirm Delete", f"Delete {product_name}?")
 
             if confirm:
-                self.manager.products = [p for p in self.manager.products if p.name != product_name]
-                self.manager.save_data()
+                self.manager.delete_product(product_name)
                 self.view_products()
         vsb = ttk.Scrollbar(tree_frame, orient="vertical", command=tree.yview)
         tree.configure(yscrollcommand=vsb.set)
@@ -640,7 +662,7 @@ class BakeryGUI:
                 invalid_products = []
                 for product_name in items:
 
-                    if not any(p.name == product_name for p in self.manager.products):
+                    if not self.manager.get_product(product_name):
                         invalid_products.append(product_name)
 
                 if invalid_products:
@@ -681,10 +703,11 @@ class BakeryGUI:
 
     def view_orders(self):
         self.clear_content()
+        self.manager.refresh("orders")
         ttk.Label(self.content_frame, text="View Orders", style='Header.TLabel').pack(pady=10)
         container = ttk.Frame(self.content_frame)
         container.pack(fill='both', expand=True, padx=20, pady=10)
-        tree = ttk.Treeview(container, columns=("ID", "Customer Name", "Items", "Total", "Status", "Action"), show='headings')
+        tree = PagedTreeview(container, columns=("ID", "Customer Name", "Items", "Total", "Status", "Action"), show='headings')
         tree.column("ID", anchor="center", width=150)
         tree.column("Customer Name", anchor="center", width=200)
         tree.column("Items", anchor="center", width=400)
@@ -702,16 +725,14 @@ class BakeryGUI:
         hsb.grid(row=1, column=0, sticky="ew")
         container.grid_rowconfigure(0, weight=1)
         container.grid_columnconfigure(0, weight=1)
-        for order in self.manager.orders:
-            items_str = ", ".join([f"{k} ({v})" for k, v in order.items.items()])
-            tree.insert("", "end", values=(
-                order.order_id,
-                order.customer_name,
-                items_str,
-                f"${order.total:.2f}",
-                order.status,
-                '❌'
-            ))
+        tree.set_rows(self.manager.orders, lambda order: (
+            order.order_id,
+            order.customer_name,
+            ", ".join([f"{k} ({v})" for k, v in order.items.items()]),
+            f"${order.total:.2f}",
+            order.status,
+            '❌'
+        ))
 
         def on_tree_click(event):
             region = tree.identify("region", event.x, event.y)
@@ -723,15 +744,10 @@ class BakeryGUI:
 
                 if column == "#6":  # Action column
                     order_id = tree.item(item, "values")[0]
-                    for idx, order in enumerate(self.manager.orders):
-
-                        if order.order_id == order_id:
+                    if messagebox.askyesno("Confirm Delete", f"Delete order {order_id}?"):
 
-                            if messagebox.askyesno("Confirm Delete", f"Delete order {order_id}?"):
-                                del self.manager.orders[idx]
-                                self.manager.save_data()
-                                self.view_orders()
-                            break
+                        if self.manager.delete_order(order_id):
+                            self.view_orders()
 
                 if column == "#1":  # ID column
                     order_id = values[0]
@@ -796,12 +812,12 @@ class BakeryGUI:
             except ValueError:
                 messagebox.showerror("Error", "Invalid quantity! Must be positive number.")
                 return
-            order = next((o for o in self.manager.orders if o.order_id == order_id), None)
+            order = self.manager.get_order(order_id)
 
             if not order:
                 messagebox.showerror("Error", "Order not found!")
                 return
-            product = next((p for p in self.manager.products if p.name == product_name), None)
+            product = self.manager.get_product(product_name)
 
             if not product:
                 messagebox.showerror("Error", "Product not found!")
@@ -811,14 +827,9 @@ class BakeryGUI:
                 messagebox.showerror("Error", f"Only {product.quantity} {product_name} available!")
                 return
 
-            if product_name in order.items:
-                order.items[product_name] += quantity
-            else:
-                order.items[product_name] = quantity
-            order.total += product.price * quantity
-            product.quantity -= quantity
-            order.status = "Updated"
-            self.manager.save_data()
+            if not self.manager.add_order_item(order, product, quantity):
+                messagebox.showerror("Error", f"Only {product.quantity} {product_name} available!")
+                return
             messagebox.showinfo("Success", f"Added {quantity} {product_name} to Order {order_id}")
             self.update_order_status_window()
 
@@ -842,6 +853,7 @@ class BakeryGUI:
 
     def add_staff_window(self):
         self.clear_content()
+        self.manager.refresh("staff")
         ttk.Label(self.content_frame, text="Add Staff Member", style='Header.TLabel').pack(pady=10)
         main_frame = ttk.Frame(self.content_frame)
         main_frame.place(relx=0.5, rely=0.4, anchor='center')
@@ -909,6 +921,7 @@ class BakeryGUI:
 
     def view_staff(self):
         self.clear_content()
+        self.manager.refresh("staff")
         ttk.Label(self.content_frame, text="View Staff Members", style='Header.TLabel').pack(pady=10)
         container = ttk.Frame(self.content_frame)
         container.pack(fill='both', expand=True, padx=20, pady=10)
@@ -933,7 +946,8 @@ class BakeryGUI:
         vsb.grid(row=0, column=1, sticky='ns')
         container.grid_rowconfigure(0, weight=1)
         container.grid_columnconfigure(0, weight=1)
-        for idx, staff in enumerate(self.manager.staff):
+        members = list(self.manager.staff)
+        for idx, staff in enumerate(members):
             tree.insert(
                 "", "end",
                 text=str(idx+1),
@@ -967,16 +981,17 @@ class BakeryGUI:
 
             try:
 
-                if 0 <= index < len(self.manager.staff):
+                if 0 <= index < len(members):
                     confirm = messagebox.askyesno(
                         "Confirm Delete",
-                        f"Are you sure you want to delete {self.manager.staff[index].name}?",
+                        f"Are you sure you want to delete {members[index].name}?",
                         parent=self.content_frame
                     )
 
                     if confirm:
-                        del self.manager.staff[index]
-                        self.manager.save_data()
+
+                        if self.manager.delete_staff(members[index]) is None:
+                            messagebox.showerror("Error", "Staff member not found!", parent=self.content_frame)
                         self.view_staff()
                 else:
                     messagebox.showerror("Error", "Invalid staff member selection!", parent=self.content_frame)
@@ -1030,6 +1045,7 @@ class BakeryGUI:
 
     def view_inventory(self):
         self.clear_content()
+        self.manager.refresh("ingredients")
         ttk.Label(self.content_frame, text="Current Inventory", style='Header.TLabel').pack(pady=10)
         tree_frame = ttk.Frame(self.content_frame)
         tree_frame.pack(fill='both', expand=True)
@@ -1060,10 +1076,13 @@ class BakeryGUI:
         vsb.grid(row=0, column=1, sticky='ns')
         tree_frame.grid_rowconfigure(0, weight=1)
         tree_frame.grid_columnconfigure(0, weight=1)
-        for idx, ing in enumerate(self.manager.ingredients):
-            tree.insert("", "end",
-                    values=(ing.name, f"{ing.quantity}", ing.unit, f"{ing.reorder_level}", "❌ Delete"),
-                    tags=(idx,))
+        ingredients = list(self.manager.ingredients)
+        self.populate_tree(
+            tree,
+            enumerate(ingredients),
+            lambda entry: (entry[1].name, f"{entry[1].quantity}", entry[1].unit, f"{entry[1].reorder_level}", "❌ Delete"),
+            tags=lambda entry: (entry[0],)
+        )
         tree.tag_configure('delete', foreground='red', font=('Arial', 9, 'bold'))
 
         def on_tree_click(event):
@@ -1082,7 +1101,7 @@ class BakeryGUI:
         def delete_ingredient(index):
 
             try:
-                ingredient = self.manager.ingredients[index]
+                ingredient = ingredients[index]
                 confirm = messagebox.askyesno(
                     "Confirm Delete",
                     f"Are you sure you want to delete {ingredient.name}?",
@@ -1090,8 +1109,9 @@ class BakeryGUI:
                 )
 
                 if confirm:
-                    del self.manager.ingredients[index]
-                    self.manager.save_data()
+
+                    if self.manager.delete_ingredient(ingredient) is None:
+                        messagebox.showerror("Error", "Ingredient not found!", parent=self.content_frame)
                     self.view_inventory()
 
             except (IndexError, TypeError):
@@ -1119,18 +1139,30 @@ class BakeryGUI:
 
             try:
                 quantity = float(quantity)
-                product = next((p for p in self.manager.products if p.name == product_name), None)
 
-                if product:
-                    product.quantity += quantity
-                    self.manager.save_data()
-                    messagebox.showinfo("Success", f"Added {quantity} units to {product_name}!")
-                    self.product_status_window()
-                else:
-                    messagebox.showerror("Error", "Product not found!")
+                if not 0 < quantity < float("inf"):  # also rejects "nan"
+                    raise ValueError
 
             except ValueError:
-                messagebox.showerror("Error", "Invalid quantity input!")
+                messagebox.showerror("Error", "Invalid quantity! Must be positive number.")
+                return
+
+            if not self.manager.get_product(product_name):
+                messagebox.showerror("Error", "Product not found!")
+                return
+            shortages = self.manager.production_shortages({product_name: quantity})
+
+            if shortages:
+                missing = ", ".join(f"{name} ({amount:g} more)" for name, amount in shortages.items())
+                messagebox.showerror("Error", f"Not enough ingredients: {missing}")
+                return
+
+            if not self.manager.produce_products({product_name: quantity}):
+                # Another till may have used the ingredients since the shortage check
+                messagebox.showerror("Error", f"Could not bake {product_name}: not enough ingredients!")
+                return
+            messagebox.showinfo("Success", f"Added {quantity} units to {product_name}!")
+            self.product_status_window()
 
         def back():
 
@@ -1153,10 +1185,11 @@ class BakeryGUI:
 
     def pending_orders(self):
         self.clear_content()
+        self.manager.refresh("orders")
         ttk.Label(self.content_frame, text="Pending Orders", style='Header.TLabel').pack(pady=10)
         container = ttk.Frame(self.content_frame)
         container.pack(fill='both', expand=True, padx=20, pady=10)
-        tree = ttk.Treeview(
+        tree = PagedTreeview(
             container,
             columns=("Select", "Order ID", "Customer Name", "Items", "Total", "Timestamp"),
             show='headings',
@@ -1187,15 +1220,14 @@ class BakeryGUI:
         self.checked_img.put(("green",), to=(0, 0, 17, 17))
         self.unchecked_img.put(("white",), to=(0, 0, 17, 17))
         self.selected_orders = set()
-        for order in self.manager.orders:
-
-            if order.status == "Pending":
-                items_str = ", ".join([f"{k} ({v})" for k, v in order.items.items()])
-                tree.insert("", "end",
-                        values=("☐", order.order_id, order.customer_name, items_str,
-                                f"${order.total:.2f}",
-                                order.timestamp.strftime("%Y-%m-%d %I:%M %p")),
-                        tags=(order.order_id,))
+        tree.set_rows(
+            self.manager.pending_orders(),
+            lambda order: ("☐", order.order_id, order.customer_name,
+                           ", ".join([f"{k} ({v})" for k, v in order.items.items()]),
+                           f"${order.total:.2f}",
+                           order.timestamp.strftime("%Y-%m-%d %I:%M %p")),
+            tags=lambda order: (order.order_id,)
+        )
 
         def on_tree_click(event):
             region = tree.identify("region", event.x, event.y)
@@ -1227,11 +1259,7 @@ class BakeryGUI:
         btn_mark.pack_forget()
 
         def mark_orders_complete():
-            for order in self.manager.orders:
-
-                if order.order_id in self.selected_orders:
-                    order.status = "Completed"
-            self.manager.save_data()
+            self.manager.complete_orders(self.selected_orders)
             self.selected_orders.clear()
             self.sold_items()
         self.mark_orders_complete = mark_orders_complete
@@ -1241,10 +1269,11 @@ class BakeryGUI:
 
     def sold_items(self):
         self.clear_content()
+        self.manager.refresh("products", "orders")
         ttk.Label(self.content_frame, text="Sold Items Report", style='Header.TLabel').pack(pady=10)
         container = ttk.Frame(self.content_frame)
         container.pack(fill='both', expand=True, padx=20, pady=10)
-        tree = ttk.Treeview(
+        tree = PagedTreeview(
             container,
             columns=("Customer Name", "Order ID", "Product Name", "Quantity Sold", "Total Revenue", 'Action'),
             show='headings',
@@ -1270,23 +1299,20 @@ class BakeryGUI:
         hsb.grid(row=1, column=0, sticky='ew')
         container.grid_rowconfigure(0, weight=1)
         container.grid_columnconfigure(0, weight=1)
+        lines = []
         total_revenue = 0
         for order in self.manager.orders:
 
             if order.status == "Completed":
                 for product_name, qty in order.items.items():
-                    price = self.manager.get_product_price(product_name)
-                    revenue = price * qty
+                    revenue = order.line_revenue(product_name, self.manager.get_product_price)
                     total_revenue += revenue
-                    tree.insert("", "end", values=(
-                        order.customer_name,
-                        order.order_id,
-                        product_name,
-                        qty,
-                        f"${revenue:.2f}",
-                        '❌ Delete'
-                    ))
-        tree.insert("", "end", values=("TOTAL", "", "", "", f"${total_revenue:.2f}"), tags=('total',))
+                    lines.append((order, product_name, qty, revenue))
+        tree.set_rows(
+            lines,
+            lambda line: (line[0].customer_name, line[0].order_id, line[1], line[2], f"${line[3]:.2f}", '❌ Delete'),
+            footer={"values": ("TOTAL", "", "", "", f"${total_revenue:.2f}"), "tags": ('total',)}
+        )
         tree.tag_configure('total', background='#e8f4ff', font=('Arial', 10, 'bold'))
 
         def on_tree_click(event):
@@ -1304,53 +1330,64 @@ class BakeryGUI:
                         f"Are you sure you want to delete {product_name} from Order {order_id}?"
                     )
 
-                    if confirm:
-                        for order in self.manager.orders:
-
-                            if order.order_id == order_id:
-
-                                if product_name in order.items:
-                                    del order.items[product_name]
-                                    self.manager.save_data()
-                                    self.sold_items()
-                                break
+                    if confirm and self.manager.remove_order_item(order_id, product_name):
+                        self.sold_items()
         tree.bind("<1>", on_tree_click)
         ttk.Button(self.content_frame, text="◄ Back", command=self.sells_report_management).pack(pady=10)
 
     def earning(self):
         self.clear_content()
+        self.manager.refresh("orders")
         ttk.Label(self.content_frame, text="Earnings Report", style='Header.TLabel').pack(pady=10)
         now = datetime.now()
-        daily_total = 0
-        weekly_total = 0
-        monthly_total = 0
-        for order in self.manager.orders:
-
-            if order.status == "Completed":
-                order_date = order.timestamp
-
-                if order_date.date() == now.date():
-                    daily_total += order.total
-
-                if order_date.isocalendar()[1] == now.isocalendar()[1]:
-                    weekly_total += order.total
-
-                if order_date.month == now.month:
-                    monthly_total += order.total
+        stats = self.manager.sales_stats
         metrics_frame = ttk.Frame(self.content_frame)
         metrics_frame.pack(pady=20)
         periods = [
-            ("Today's Earnings", daily_total),
-            ("Weekly Earnings", weekly_total),
-            ("Monthly Earnings", monthly_total),
-            ("Total Earnings", sum(o.total for o in self.manager.orders if o.status == "Completed"))
+            ("Today's Earnings", stats.day(now)),
+            ("Weekly Earnings", stats.week(now)),
+            ("Monthly Earnings", stats.month(now)),
+            ("Total Earnings", stats.total_revenue)
         ]
         for i, (label, value) in enumerate(periods):
             ttk.Label(metrics_frame, text=label, font=('Arial', 12, 'bold')).grid(row=i, column=0, padx=20, pady=8, sticky='w')
             ttk.Label(metrics_frame, text=f"${value:.2f}", font=('Arial', 12)).grid(row=i, column=1, padx=20, pady=8, sticky='e')
+        range_frame = ttk.Frame(self.content_frame)
+        range_frame.pack(pady=10)
+        ttk.Label(range_frame, text="From:", foreground=self.entry_label_color, font=self.label_font_style).grid(row=0, column=0, padx=5)
+        start_entry = PlaceholderEntry(range_frame, placeholder="YYYY-MM-DD")
+        start_entry.grid(row=0, column=1, padx=5)
+        ttk.Label(range_frame, text="To:", foreground=self.entry_label_color, font=self.label_font_style).grid(row=0, column=2, padx=5)
+        end_entry = PlaceholderEntry(range_frame, placeholder="YYYY-MM-DD")
+        end_entry.grid(row=0, column=3, padx=5)
+        range_result = ttk.Label(range_frame, text="", font=('Arial', 12, 'bold'))
+        range_result.grid(row=1, column=0, columnspan=5, pady=8)
+
+        def show_range():
+
+            try:
+                start = datetime.strptime(start_entry.get_value(), "%Y-%m-%d").date()
+                end = datetime.strptime(end_entry.get_value() or start_entry.get_value(), "%Y-%m-%d").date()
+
+            except ValueError:
+                messagebox.showerror("Error", "Dates must be in YYYY-MM-DD format!")
+                return
+
+            if end < start:
+                messagebox.showerror("Error", "The end date is before the start date!")
+                return
+            range_result.config(text=f"Earnings {start} to {end}: ${stats.between(start, end):.2f}")
+        ttk.Button(range_frame, text="Calculate", command=show_range).grid(row=0, column=4, padx=5)
         ttk.Button(self.content_frame, text="◄ Back", command=self.sells_report_management).pack(pady=10)
 
 if __name__ == "__main__":
     root = tk.Tk()
-    app = BakeryGUI(root)
+
+    try:
+        app = BakeryGUI(root)
+
+    except StorageError as e:
+        messagebox.showerror("Data Error", str(e))
+        root.destroy()
+        sys.exit(1)
     root.mainloop()
@@ -0,0 +1,115 @@
+class RecipeBook:
+    """Product recipes compiled against the ingredient list.
+
+    Each recipe becomes a sparse vector of (ingredient index, amount per unit). A whole
+    order or production batch is turned into one dense requirement vector, checked against
+    current stock and deducted in a single pass, so either every ingredient is consumed or
+    none is. Recipe ingredients that are not tracked in the inventory are ignored.
+    """
+
+    def __init__(self, ingredients, products):
+        self.ingredients = ingredients
+        self.index = {}
+        for position, ingredient in enumerate(ingredients):
+            self.index.setdefault(ingredient.name, position)
+        self.recipes = {}
+        self.prices = {}
+        self.untracked = {}
+        self._producible = (None, None)
+        for product in products:
+
+            if product.name in self.recipes:
+                continue
+            self.prices[product.name] = product.price
+            vector = []
+            for ingredient, amount in product.recipe.items():
+
+                if ingredient in self.index:
+                    vector.append((self.index[ingredient], amount))
+                else:
+                    self.untracked.setdefault(product.name, []).append(ingredient)
+            self.recipes[product.name] = vector
+
+    def requirements(self, items):
+        """Dense vector of ingredient amounts needed for {product name: quantity}"""
+        needed = [0] * len(self.ingredients)
+        for product, qty in items.items():
+            for position, amount in self.recipes.get(product, ()):
+                needed[position] += amount * qty
+        return needed
+
+    def shortages(self, items):
+        """{ingredient name: amount missing} for the items; empty when they can all be made"""
+        needed = self.requirements(items)
+        return {
+            self.ingredients[position].name: amount - self.ingredients[position].quantity
+            for position, amount in enumerate(needed)
+            if amount > self.ingredients[position].quantity
+        }
+
+    def used_ingredients(self, items):
+        """The Ingredient objects whose stock the items draw on"""
+        positions = {position for product in items for position, _ in self.recipes.get(product, ())}
+        return [self.ingredients[position] for position in sorted(positions)]
+
+    def consume(self, items):
+        """Deduct the ingredients for the items if all are available; returns the shortages otherwise"""
+        needed = self.requirements(items)
+        remaining = [ingredient.quantity - amount for ingredient, amount in zip(self.ingredients, needed)]
+
+        if any(quantity < 0 for quantity in remaining):
+            return self.shortages(items)
+        for ingredient, amount, quantity in zip(self.ingredients, needed, remaining):
+
+            if amount:
+                ingredient.quantity = quantity
+        return {}
+
+    def stock(self):
+        return tuple(ingredient.quantity for ingredient in self.ingredients)
+
+    def max_producible(self):
+        """{product: how many can be baked from current stock on their own}; None means unlimited
+
+        Cached until an ingredient quantity changes.
+        """
+        stock = self.stock()
+        cached_stock, cached = self._producible
+
+        if cached_stock != stock:
+            cached = {}
+            for product, vector in self.recipes.items():
+                limits = [int(stock[position] // amount) for position, amount in vector if amount > 0]
+                cached[product] = max(0, min(limits)) if limits else None
+            self._producible = (stock, cached)
+        return dict(cached)
+
+    def plan_production(self):
+        """Greedy plan ({product: count}, revenue) sharing current stock between products
+
+        Products are taken in order of price per unit of their scarcest ingredient, each
+        as many times as the remaining stock allows. Products with no tracked ingredients
+        (unlimited) are left out.
+        """
+        remaining = list(self.stock())
+
+        def value_density(product):
+            usage = max(amount / remaining[position] if remaining[position] > 0 else float("inf")
+                        for position, amount in self.recipes[product] if amount > 0)
+            return self.prices[product] / usage if usage else 0
+
+        candidates = [
+            product for product, vector in self.recipes.items()
+            if self.prices[product] > 0 and any(amount > 0 for _, amount in vector)
+        ]
+        plan = {}
+        for product in sorted(candidates, key=value_density, reverse=True):
+            count = min(int(remaining[position] // amount) for position, amount in self.recipes[product] if amount > 0)
+
+            if count <= 0:
+                continue
+            for position, amount in self.recipes[product]:
+                remaining[position] -= amount * count
+            plan[product] = count
+        revenue = sum(self.prices[product] * count for product, count in plan.items())
+        return plan, revenue
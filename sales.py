@@ -0,0 +1,94 @@
+import heapq
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter
+from datetime import date, timedelta
+
+class RevenueIndex:
+    """Completed revenue per calendar day, with the days kept sorted for range queries"""
+
+    def __init__(self):
+        self.days = []
+        self.revenue = {}
+
+    def add(self, day, amount):
+        ordinal = day.toordinal()
+
+        if ordinal not in self.revenue:
+            insort(self.days, ordinal)
+            self.revenue[ordinal] = 0
+        self.revenue[ordinal] += amount
+
+    def between(self, start, end):
+        """Revenue from day `start` through day `end`, both inclusive"""
+        lo = bisect_left(self.days, start.toordinal())
+        hi = bisect_right(self.days, end.toordinal())
+        return sum(self.revenue[ordinal] for ordinal in self.days[lo:hi])
+
+class SalesStats:
+    """Running sales totals, kept current by adding/removing one order at a time.
+
+    Revenue counts Completed orders only; product quantities count every order, as the
+    popular products report always has.
+    """
+
+    def __init__(self, orders=()):
+        self.total_revenue = 0
+        self.completed_orders = 0
+        self.order_count = 0
+        self.product_quantities = Counter()
+        self.daily_product_quantities = {}
+        self.revenue_index = RevenueIndex()
+        for order in orders:
+            self.add(order)
+
+    def _apply(self, order, sign):
+        self.order_count += sign
+        day = order.timestamp.date()
+        day_quantities = self.daily_product_quantities.setdefault(day.toordinal(), Counter())
+        for product, qty in order.items.items():
+            for quantities in (self.product_quantities, day_quantities):
+                quantities[product] += sign * qty
+
+                if quantities[product] == 0:
+                    del quantities[product]
+
+        if order.status != "Completed":
+            return
+        revenue = sign * order.total
+        self.total_revenue += revenue
+        self.completed_orders += sign
+        self.revenue_index.add(day, revenue)
+
+    def add(self, order):
+        self._apply(order, 1)
+
+    def remove(self, order):
+        self._apply(order, -1)
+
+    def between(self, start, end):
+        return self.revenue_index.between(start, end)
+
+    def top_products(self, k, days=None, today=None):
+        """The k best sellers by quantity, over all time or over the last `days` days up to `today`"""
+
+        if days is None:
+            quantities = self.product_quantities
+        else:
+            last = (today or date.today()).toordinal()
+            quantities = Counter()
+            for ordinal in range(last - days + 1, last + 1):
+                quantities.update(self.daily_product_quantities.get(ordinal, ()))
+        return heapq.nlargest(k, quantities.items(), key=lambda item: item[1])
+
+    def day(self, when):
+        return self.between(when.date(), when.date())
+
+    def week(self, when):
+        """Monday to Sunday of the ISO week containing `when`"""
+        monday = when.date() - timedelta(days=when.weekday())
+        return self.between(monday, monday + timedelta(days=6))
+
+    def month(self, when):
+        first = date(when.year, when.month, 1)
+        next_month = date(when.year + when.month // 12, when.month % 12 + 1, 1)
+        return self.between(first, next_month - timedelta(days=1))
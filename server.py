@@ -0,0 +1,231 @@
+"""Headless HTTP/JSON API over BakeryManager, for tablets and extra tills without the Tk GUI.
+
+Run from the data directory: python server.py [--host 127.0.0.1] [--port 8080]
+
+    GET  /products                  every product with price and stock
+    GET  /products/<name>           one product (404 if unknown)
+    GET  /orders/pending            pending orders
+    GET  /reports/sales?top=10      sales totals and best sellers
+    POST /orders                    {"customer_name": ..., "items": {product: qty}} -> 201 with the order
+    POST /restock                   {"name": ingredient, "quantity": amount}
+
+Both POST endpoints also take a JSON array of such objects and answer 207 with an array of
+{"code": <HTTP status>, "result": <response>} per item, so a client can send a batch in one
+request; the whole batch is group-committed with one journal write and one save.
+Connections are kept alive (HTTP/1.1) and each one is served on its own thread.
+"""
+import argparse
+import json
+import math
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from bakery import BakeryManager
+from storage import StorageError
+
+MAX_BODY_BYTES = 1 << 20
+
+class RequestError(Exception):
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+def product_to_json(product):
+    return {"name": product.name, "price": product.price, "quantity": product.quantity}
+
+def order_to_json(order):
+    return {
+        "order_id": order.order_id,
+        "customer_name": order.customer_name,
+        "items": order.items,
+        "total": order.total,
+        "status": order.status,
+        "timestamp": order.timestamp.isoformat()
+    }
+
+def positive_number(value, field):
+
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value) or value <= 0:
+        raise RequestError(400, f"'{field}' must be a positive number")
+    return value
+
+class BakeryRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive: several requests per connection
+    server_version = "BakeryAPI/1.0"
+    # Headers and body go out in separate writes; without TCP_NODELAY every keep-alive
+    # response waits on the client's delayed ACK
+    disable_nagle_algorithm = True
+
+    @property
+    def manager(self):
+        return self.server.manager
+
+    def log_message(self, format, *args):
+
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload, separators=(",", ":")).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def read_json(self):
+
+        try:
+            return json.loads(self.body or b"null")
+
+        except ValueError:
+            raise RequestError(400, "Request body is not valid JSON")
+
+    def dispatch(self, routes):
+        url = urlsplit(self.path)
+        parts = [unquote(part) for part in url.path.strip("/").split("/") if part]
+
+        try:
+            for pattern, handler in routes:
+
+                if len(pattern) == len(parts) and all(p.startswith("<") or p == v for p, v in zip(pattern, parts)):
+                    args = [v for p, v in zip(pattern, parts) if p.startswith("<")]
+                    status, payload = handler(*args, query=parse_qs(url.query))
+                    break
+            else:
+                raise RequestError(404, f"No such endpoint: {url.path}")
+
+        except RequestError as e:
+            status, payload = e.status, {"error": str(e)}
+
+        except StorageError as e:
+            status, payload = 503, {"error": f"Storage failure: {e}"}
+        self.send_json(status, payload)
+
+    def do_GET(self):
+        self.dispatch([
+            (("products",), self.list_products),
+            (("products", "<name>"), self.get_product),
+            (("orders", "pending"), self.pending_orders),
+            (("reports", "sales"), self.sales_report),
+        ])
+
+    def do_POST(self):
+        # Read the whole body first so the connection stays in step for the next request
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+
+        except ValueError:
+            length = -1
+
+        if not 0 <= length <= MAX_BODY_BYTES:
+            self.close_connection = True
+            self.send_json(413 if length > 0 else 400, {"error": "Missing or oversized request body"})
+            return
+        self.body = self.rfile.read(length)
+        self.dispatch([
+            (("orders",), self.batched(self.create_order)),
+            (("restock",), self.batched(self.restock)),
+        ])
+
+    def batched(self, handler):
+        """Run handler on one JSON object, or on each object of a JSON array (answering 207 with every result)"""
+
+        def endpoint(query):
+            body = self.read_json()
+
+            if not isinstance(body, list):
+                return handler(body)
+            results = []
+
+            with self.manager.batch():
+                for item in body:
+
+                    try:
+                        status, payload = handler(item)
+
+                    except RequestError as e:
+                        status, payload = e.status, {"error": str(e)}
+                    results.append({"code": status, "result": payload})
+            return 207, results
+        return endpoint
+
+    def list_products(self, query):
+        self.manager.refresh("products")
+        return 200, [product_to_json(product) for product in self.manager.products]
+
+    def get_product(self, name, query):
+        product = self.manager.get_product(name)
+
+        if not product:
+            raise RequestError(404, f"Unknown product: {name}")
+        return 200, product_to_json(product)
+
+    def pending_orders(self, query):
+        return 200, [order_to_json(order) for order in self.manager.pending_orders()]
+
+    def sales_report(self, query):
+
+        try:
+            top = int(query.get("top", ["10"])[0])
+
+        except ValueError:
+            raise RequestError(400, "'top' must be an integer")
+        self.manager.refresh("orders")
+        report = self.manager.generate_sales_report(top)
+        report["popular_products"] = [list(entry) for entry in report["popular_products"]]
+        return 200, report
+
+    def create_order(self, body):
+
+        if not isinstance(body, dict) or not isinstance(body.get("items"), dict) or not body["items"]:
+            raise RequestError(400, "Expected {\"customer_name\": ..., \"items\": {product: quantity}}")
+        items = {str(name): positive_number(qty, name) for name, qty in body["items"].items()}
+        order = self.manager.create_order(str(body.get("customer_name", "")), items)
+
+        if not order:
+            raise RequestError(409, "Unknown product or not enough stock")
+        return 201, order_to_json(order)
+
+    def restock(self, body):
+
+        if not isinstance(body, dict) or "name" not in body:
+            raise RequestError(400, "Expected {\"name\": ingredient, \"quantity\": amount}")
+        name = str(body["name"])
+        quantity = positive_number(body.get("quantity"), "quantity")
+
+        if not self.manager.restock_ingredient(name, quantity):
+            raise RequestError(404, f"Unknown ingredient: {name}")
+        ingredient = self.manager.get_ingredient(name)
+        return 200, {"name": ingredient.name, "quantity": ingredient.quantity}
+
+class BakeryServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, manager=None, quiet=False):
+        self.manager = manager if manager else BakeryManager()
+        self.quiet = quiet
+        super().__init__(address, BakeryRequestHandler)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--quiet", action="store_true", help="don't log each request")
+    args = parser.parse_args()
+    server = BakeryServer((args.host, args.port), quiet=args.quiet)
+    print(f"Bakery API listening on http://{args.host}:{server.server_address[1]}")
+
+    try:
+        server.serve_forever()
+
+    except KeyboardInterrupt:
+        pass
+
+    finally:
+        server.server_close()
+        server.manager.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1018 @@
+import configparser
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+
+try:
+    import fcntl
+
+except ImportError:
+    fcntl = None
+
+try:
+    import msvcrt
+
+except ImportError:
+    msvcrt = None
+
+try:
+    import orjson
+
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+
+except ImportError:
+    msgpack = None
+INGREDIENTS_FILE = "ingredients.json"
+PRODUCTS_FILE = "products.json"
+ORDERS_FILE = "orders.json"
+STAFF_FILE = "staff.json"
+ORDERS_JOURNAL_FILE = "orders.journal"
+COMMIT_FILE = "bakery.commit"
+DATABASE_FILE = "bakery.db"
+CONFIG_FILE = "config.ini"
+JOURNAL_COMPACT_THRESHOLD = 1000
+COLLECTION_FILES = {
+    "ingredients": INGREDIENTS_FILE,
+    "products": PRODUCTS_FILE,
+    "orders": ORDERS_FILE,
+    "staff": STAFF_FILE
+}
+COLLECTIONS = tuple(COLLECTION_FILES)
+
+class StorageError(Exception):
+    pass
+
+def is_recent_order(record, since):
+    """Orders that load eagerly: anything not completed, or newer than the `since` ISO timestamp"""
+    timestamp = record.get("timestamp")
+    return record.get("status") != "Completed" or not timestamp or timestamp >= since
+
+def journal_entry_id(entry):
+    return entry["order"]["order_id"] if entry["op"] == "put" else entry["order_id"]
+
+def apply_journal_entry(orders, entry):
+    """Apply one order journal entry to a dict of order records keyed by order_id"""
+
+    if entry["op"] == "put":
+        orders[entry["order"]["order_id"]] = entry["order"]
+    elif entry["op"] == "delete":
+        orders.pop(entry["order_id"], None)
+
+class JsonCodec:
+    """Compact stdlib JSON (no indentation, no spaces after separators)"""
+    name = "json"
+    suffix = ".json"
+
+    @staticmethod
+    def dumps(obj):
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+    @staticmethod
+    def loads(data):
+        return json.loads(data)
+
+class OrjsonCodec:
+    """Same files as JsonCodec, encoded and decoded by the much faster orjson"""
+    name = "orjson"
+    suffix = ".json"
+
+    @staticmethod
+    def dumps(obj):
+        return orjson.dumps(obj)
+
+    @staticmethod
+    def loads(data):
+        return orjson.loads(data)
+
+class MsgpackCodec:
+    """Binary MessagePack files; smallest on disk, not human readable"""
+    name = "msgpack"
+    suffix = ".msgpack"
+
+    @staticmethod
+    def dumps(obj):
+        return msgpack.packb(obj, use_bin_type=True)
+
+    @staticmethod
+    def loads(data):
+        return msgpack.unpackb(data, raw=False)
+
+CODECS = {
+    "json": (JsonCodec, True),
+    "orjson": (OrjsonCodec, orjson is not None),
+    "msgpack": (MsgpackCodec, msgpack is not None)
+}
+
+def get_codec(name="json"):
+    """Look up a codec by name; "auto" picks orjson when it is installed"""
+
+    if name == "auto":
+        name = "orjson" if orjson is not None else "json"
+
+    if name not in CODECS:
+        raise StorageError(f"Unknown codec: {name}")
+    codec, available = CODECS[name]
+
+    if not available:
+        raise StorageError(f"The {name} codec needs the '{name}' package (pip install {name})")
+    return codec
+
+def fsync_directory(path):
+    """Make renames inside a directory durable (no-op where directories can't be opened)"""
+
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY | os.O_DIRECTORY)
+
+    try:
+        os.fsync(fd)
+
+    finally:
+        os.close(fd)
+
+def write_durably(path, data, suffix=".tmp"):
+    """Write a temp file next to path and fsync it; the caller decides when to rename it in"""
+    temp_path = path + suffix
+
+    with open(temp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    return temp_path
+
+class FileLock:
+    """Exclusive lock on a small file, held across processes (fcntl, or msvcrt on Windows;
+    a plain thread lock where neither exists). Re-entrant for the thread holding it.
+
+    The file also holds a version number for the data the lock guards, bumped by every writer.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+        self.depth = 0
+        self._thread_lock = threading.RLock()
+
+    def acquire(self):
+        self._thread_lock.acquire()
+
+        if self.depth == 0:
+
+            try:
+                self.file = open(self.path, "a+b")
+                self._lock_file()
+
+            except BaseException:
+
+                if self.file is not None:
+                    self.file.close()
+                    self.file = None
+                self._thread_lock.release()
+                raise
+        self.depth += 1
+
+    def release(self):
+        self.depth -= 1
+
+        if self.depth == 0:
+
+            try:
+                self._unlock_file()
+
+            finally:
+                self.file.close()
+                self.file = None
+        self._thread_lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+    def _lock_file(self):
+
+        if fcntl is not None:
+            fcntl.flock(self.file.fileno(), fcntl.LOCK_EX)
+        elif msvcrt is not None:
+            self.file.seek(0)
+
+            while True:
+
+                try:
+                    msvcrt.locking(self.file.fileno(), msvcrt.LK_LOCK, 1)
+                    return
+
+                except OSError:
+                    continue  # LK_LOCK gives up after about 10 seconds; keep waiting
+
+    def _unlock_file(self):
+
+        if fcntl is not None:
+            fcntl.flock(self.file.fileno(), fcntl.LOCK_UN)
+        elif msvcrt is not None:
+            self.file.seek(0)
+            msvcrt.locking(self.file.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def version(self):
+        """The stored version number; only meaningful while the lock is held"""
+        self.file.seek(0)
+        data = self.file.read().strip()
+        return int(data) if data else 0
+
+    def bump(self):
+        version = self.version() + 1
+        self.file.seek(0)
+        self.file.truncate()
+        self.file.write(str(version).encode())
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        return version
+
+class JsonStorage:
+    """One snapshot file per collection plus an append-only JSON Lines journal for orders.
+
+    With shared=True several processes can use the same files: each collection has a lock
+    file holding its version stamp, writers bump the stamp under the lock, and readers compare
+    it with the version they loaded (is_stale) to find out another process changed it. Orders
+    are appended to the journal under the orders lock and other processes pick the new lines
+    up with journal_tail().
+
+    Completed orders older than the cutoff passed to compact_journal() move out of the orders
+    snapshot into an archive file (orders.archive.json), read only by load_order_history()
+    and load("orders"), so a cold start parses just the recent snapshot and the journal.
+    """
+    journaled = True
+
+    def __init__(self, files=None, journal_file=ORDERS_JOURNAL_FILE, commit_file=COMMIT_FILE, codec=JsonCodec,
+                 shared=False):
+        self.codec = codec
+        self.legacy_files = dict(COLLECTION_FILES, **(files or {}))
+        self.files = {
+            name: os.path.splitext(path)[0] + codec.suffix for name, path in self.legacy_files.items()
+        }
+        self.archive_file = os.path.splitext(self.files["orders"])[0] + ".archive" + codec.suffix
+        # Each data file with the JSON file it replaces when codec is a binary one
+        self.legacy_paths = {self.files[name]: path for name, path in self.legacy_files.items()}
+        self.legacy_paths[self.archive_file] = os.path.splitext(self.archive_file)[0] + JsonCodec.suffix
+        self._converted = {}
+        self.journal_file = journal_file
+        self.commit_file = commit_file
+        self.journal_size = 0
+        self.journal_offset = 0
+        self.order_history = []
+        # Orders in the snapshot or journal as last loaded, or journaled since: archived copies are out of date
+        self._shadowed = set()
+        self.max_order_id = None
+        self.shared = shared
+        self.versions = {}
+        # Guards the journal file and the offsets into it between appending and compacting threads
+        self._journal_lock = threading.RLock()
+        self._journal_generation = 0
+        self.file_locks = {
+            name: FileLock(os.path.splitext(path)[0] + ".lock") for name, path in self.legacy_files.items()
+        }
+        self.file_locks["commit"] = FileLock(commit_file + ".lock")
+
+        with self.locked(*self.file_locks):
+            self.recover()
+            for path in self.legacy_paths:
+                self._source(path)  # refuse to start on files left by a different codec
+
+    @contextmanager
+    def locked(self, *collections):
+        """Hold the cross-process locks of the collections (in a fixed order); a no-op unless shared"""
+
+        if not self.shared:
+            yield
+            return
+
+        with ExitStack() as stack:
+            for name in self.file_locks:
+
+                if name in collections:
+                    stack.enter_context(self.file_locks[name])
+            yield
+
+    def is_stale(self, collection):
+        """True when another process saved the collection since this one loaded it (hold its lock)"""
+
+        if not self.shared:
+            return False
+
+        with self.locked(collection):
+            return self.file_locks[collection].version() != self.versions.get(collection)
+
+    def recover(self):
+        """Finish a save that crashed after its commit point, or discard one that crashed before it"""
+
+        try:
+
+            with open(self.commit_file, "r") as f:
+                committed = json.load(f)
+
+        except FileNotFoundError:
+            committed = []
+        for path in [*self.files.values(), self.journal_file]:
+            temp_path = path + ".tmp"
+
+            if not os.path.exists(temp_path):
+                continue
+
+            if path in committed:
+                os.replace(temp_path, path)
+            else:
+                os.remove(temp_path)
+
+        for path in (self.files["orders"], self.archive_file):
+
+            if os.path.exists(path + ".compact"):
+                os.remove(path + ".compact")  # from a compaction that crashed before its swap
+
+        if os.path.exists(self.commit_file):
+            fsync_directory(self.commit_file)
+            os.remove(self.commit_file)
+
+    def load(self, collection):
+
+        with self.locked(collection):
+            records = self._load(collection)
+
+            if collection == "orders":
+                records = self._read_archive(skip=self._shadowed) + records
+            return records
+
+    def _load(self, collection):
+
+        if self.shared:
+            self.versions[collection] = self.file_locks[collection].version()
+        records = self._read(collection)
+
+        if collection == "orders":
+            self._shadowed = {record["order_id"] for record in records}
+            records = self.replay_journal(records)
+        return records
+
+    def _source(self, path):
+        """The file to read for `path` and its codec. After switching to a binary codec that is
+        the old JSON file until the next save converts it; any other file a different codec
+        wrote next to `path` would be silently ignored, so it is an error."""
+        base = os.path.splitext(path)[0]
+        others = {base + codec.suffix for codec, _ in CODECS.values()} | {self.legacy_paths[path]}
+        others = sorted(other for other in others - {path} if os.path.exists(other))
+
+        if not others:
+            return path, self.codec
+
+        if os.path.exists(path) or others != [self.legacy_paths[path]] or self.codec.suffix == JsonCodec.suffix:
+            raise StorageError(
+                f"Found {' and '.join(others)} next to {path}, written with a different codec; set codec in the "
+                "[Storage] section of config.ini to the one that wrote the current data and remove the stale file"
+            )
+        self._converted[path] = others[0]
+        return others[0], JsonCodec
+
+    def _retire_legacy(self, path):
+        """Once `path` is written with the configured codec, set aside the JSON file it was converted from"""
+        legacy = self._converted.pop(path, None)
+
+        if legacy and os.path.exists(legacy):
+            os.replace(legacy, legacy + ".bak")
+
+    def _read(self, collection):
+        path, codec = self._source(self.files[collection])
+        return self._decode(path, codec, collection)
+
+    def _read_archive(self, skip=()):
+        """Archived order records, leaving out the order_ids in `skip`"""
+        path, codec = self._source(self.archive_file)
+        return [record for record in self._decode(path, codec, "orders") if record["order_id"] not in skip]
+
+    def _decode(self, path, codec, collection):
+
+        try:
+
+            with open(path, "rb") as f:
+                records = codec.loads(f.read())
+
+        except FileNotFoundError:
+            records = []
+
+        except ValueError as e:
+            raise StorageError(f"{path} is corrupt ({e}); refusing to start with an empty {collection} list") from e
+        return records
+
+    def load_recent_orders(self, since):
+        """Orders for is_recent_order(); the rest are held back for load_order_history()"""
+        recent, self.order_history = [], []
+
+        with self.locked("orders"):
+            records = self._load("orders")
+        for record in records:
+            (recent if is_recent_order(record, since) else self.order_history).append(record)
+        self.max_order_id = max((record["order_id"] for record in records), default="")
+        return recent
+
+    def last_order_id(self):
+        """Highest order_id on disk as of the last load (IDs sort by creation time)"""
+
+        if self.max_order_id is None:
+            self.load_recent_orders("")
+            self.order_history = []
+        return self.max_order_id
+
+    def load_order_history(self, since):
+        """The older orders held back by load_recent_orders(), then the archive"""
+        history, self.order_history = self.order_history, []
+
+        with self.locked("orders"):
+            return self._read_archive(skip=self._shadowed) + history
+
+    def replay_journal(self, records):
+        """Apply the order journal on top of the orders snapshot"""
+
+        with self._journal_lock:
+            return self._replay_journal(records)
+
+    def _replay_journal(self, records):
+        self.journal_offset = 0
+
+        try:
+
+            with open(self.journal_file, "rb") as f:
+                lines = f.readlines()
+
+        except FileNotFoundError:
+            return records
+        orders = {record["order_id"]: record for record in records}
+        valid_bytes = 0
+        for line_no, line in enumerate(lines):
+
+            try:
+                # A final line without its newline is torn even if it parses: appends finish with "\n"
+                entry = json.loads(line) if line.endswith(b"\n") else None
+
+            except json.JSONDecodeError:
+                entry = None
+
+            if entry is None:
+
+                if line_no == len(lines) - 1:
+                    # Torn final append from a crash: cut it off so new entries start on a clean line
+                    with open(self.journal_file, "r+b") as f:
+                        f.truncate(valid_bytes)
+                    lines.pop()
+                    break
+                raise StorageError(f"{self.journal_file} is corrupt at line {line_no + 1}")
+            valid_bytes += len(line)
+            apply_journal_entry(orders, entry)
+            self._shadowed.add(journal_entry_id(entry))
+        self.journal_size = len(lines)
+        self.journal_offset = valid_bytes
+        return list(orders.values())
+
+    def journal_tail(self):
+        """Order changes other processes journaled since this one last read or wrote the journal,
+        as ("put", record) / ("delete", order_id) pairs (hold the orders lock)"""
+
+        with self.locked("orders"), self._journal_lock:
+
+            try:
+
+                with open(self.journal_file, "rb") as f:
+                    f.seek(self.journal_offset)
+                    data = f.read()
+
+            except FileNotFoundError:
+                return []
+            # A line still being written by another process has no newline yet; leave it for next time
+            complete = data[:data.rfind(b"\n") + 1]
+            changes = []
+            for line in complete.splitlines():
+                entry = json.loads(line)
+                changes.append(("put", entry["order"]) if entry["op"] == "put" else ("delete", entry["order_id"]))
+                self._shadowed.add(journal_entry_id(entry))
+            self.journal_offset += len(complete)
+            self.journal_size += len(changes)
+        return changes
+
+    def save(self, collection, records):
+        self.save_all({collection: records})
+
+    def save_all(self, collections):
+        """Replace several collection files atomically: all of them change or none do"""
+        names = list(collections)
+
+        if len(names) > 1:
+            names.append("commit")  # the commit marker is shared by every multi-collection save
+
+        with self.locked(*names):
+
+            if self.shared:
+                # Bump first: a crash before the files are replaced only makes others reload needlessly
+                for name in collections:
+                    self.versions[name] = self.file_locks[name].bump()
+            self._save_all(collections)
+
+    def _save_all(self, collections):
+
+        with self._journal_lock:
+            self._replace_files(collections)
+
+    def _replace_files(self, collections):
+        staged = {
+            self.files[name]: write_durably(self.files[name], self.codec.dumps(records))
+            for name, records in collections.items()
+        }
+
+        if len(staged) > 1:
+            # Commit point: once this marker is in place, recover() rolls the save forward
+            os.replace(write_durably(self.commit_file, JsonCodec.dumps(list(staged))), self.commit_file)
+            fsync_directory(self.commit_file)
+        for path, temp_path in staged.items():
+            os.replace(temp_path, path)
+            self._retire_legacy(path)
+        fsync_directory(self.commit_file)
+
+        if len(staged) > 1:
+            os.remove(self.commit_file)
+
+        if "orders" in collections:
+
+            for path in (self.archive_file, self.legacy_paths[self.archive_file]):
+
+                if os.path.exists(path):
+                    os.remove(path)  # the saved list is every order, archived ones included
+
+            with open(self.journal_file, "w"):
+                pass
+            self._journal_generation += 1
+            self.journal_size = 0
+            self.journal_offset = 0
+
+    def append_journal(self, entries):
+
+        with self.locked("orders"), self._journal_lock, open(self.journal_file, "a") as f:
+            for entry in entries:
+                f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+                self._shadowed.add(journal_entry_id(entry))
+            f.flush()
+            os.fsync(f.fileno())
+            self.journal_offset = f.tell()
+            self.journal_size += len(entries)
+
+    def compact_journal(self, since=None):
+        """Fold the order journal into the orders snapshot, working on the raw records. Given a
+        `since` cutoff, also move the orders is_recent_order() rejects out into the archive.
+
+        The journal is read and merged and the new files written while other threads keep
+        appending; only the final swap excludes them, and entries appended meanwhile carry over
+        into the new journal. With shared files the orders lock is held throughout, since another
+        process could append or compact at any point. Returns False if there was nothing to fold
+        or a full save of the orders replaced the snapshot in the meantime.
+        """
+
+        with self.locked("orders"):
+
+            with self._journal_lock:
+                generation = self._journal_generation
+
+                try:
+                    end = os.path.getsize(self.journal_file)
+
+                except FileNotFoundError:
+                    end = 0
+
+            if not end:
+                return False
+            snapshot = self._read("orders")
+            # Without the archive at hand, deletes have to stay journaled: the order may be archived
+            orders = {record["order_id"]: record for record in self._read_archive()} if since is not None else {}
+            orders.update((record["order_id"], record) for record in snapshot)
+            carried = []
+
+            with open(self.journal_file, "rb") as f:
+                for line in f.read(end).splitlines(keepends=True):
+                    entry = json.loads(line)
+                    apply_journal_entry(orders, entry)
+
+                    if since is None and entry["op"] == "delete":
+                        carried.append(line)
+            staged = {}
+
+            if since is not None:
+                archived = [record for record in orders.values() if not is_recent_order(record, since)]
+                orders = [record for record in orders.values() if is_recent_order(record, since)]
+                staged[self.archive_file] = self.codec.dumps(archived)
+            else:
+                orders = list(orders.values())
+            # The snapshot goes in last: until then it shadows any archived copy of its orders
+            staged[self.files["orders"]] = self.codec.dumps(orders)
+            # Their own temp names: a full save of the orders may be staging orders.json.tmp meanwhile
+            staged = {path: write_durably(path, data, ".compact") for path, data in staged.items()}
+
+            with self._journal_lock:
+
+                if self._journal_generation != generation:
+                    for temp_path in staged.values():
+                        os.remove(temp_path)
+                    return False
+
+                with open(self.journal_file, "rb") as f:
+                    f.seek(end)
+                    tail = b"".join(carried) + f.read()
+
+                if self.shared:
+                    # Processes (this one included) that hadn't read up to `end` have to reload
+                    lock = self.file_locks["orders"]
+                    caught_up = self.versions.get("orders") == lock.version() and self.journal_offset >= end
+                    version = lock.bump()
+
+                    if caught_up:
+                        self.versions["orders"] = version
+                for path, temp_path in staged.items():
+                    os.replace(temp_path, path)
+                    self._retire_legacy(path)
+                # A crash before the journal is cut replays all of it over the new snapshot, which
+                # ends in the same state: each order takes the value of its last entry either way
+                os.replace(write_durably(self.journal_file, tail), self.journal_file)
+                fsync_directory(self.journal_file)
+                self._journal_generation += 1
+                self.journal_offset = max(self.journal_offset - end, 0) + sum(len(line) for line in carried)
+                self.journal_size = tail.count(b"\n")
+        return True
+
+    def apply_order_changes(self, changes):
+        """Journal a sequence of ("put", record) / ("delete", order_id) changes with one fsync"""
+        self.append_journal([
+            {"op": "put", "order": value} if op == "put" else {"op": "delete", "order_id": value}
+            for op, value in changes
+        ])
+
+    def put_orders(self, records):
+        self.apply_order_changes([("put", record) for record in records])
+
+    def delete_order(self, order_id):
+        self.apply_order_changes([("delete", order_id)])
+
+    @property
+    def compact_due(self):
+        return self.journal_size >= JOURNAL_COMPACT_THRESHOLD
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+class SqliteStorage:
+    """All collections in one SQLite database (WAL mode); orders are stored row by row"""
+    FIELDS = {
+        "ingredients": ("name", "quantity", "unit", "reorder_level"),
+        "products": ("name", "price", "recipe", "quantity"),
+        "orders": ("order_id", "customer_name", "items", "total", "status", "timestamp", "prices"),
+        "staff": ("name", "role", "shifts")
+    }
+    JSON_FIELDS = {"recipe", "items", "shifts", "prices"}
+    # Numeric columns are left untyped so ints and floats round-trip exactly as in the JSON files
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS ingredients (
+            position INTEGER PRIMARY KEY, name TEXT NOT NULL, quantity,
+            unit TEXT, reorder_level);
+        CREATE INDEX IF NOT EXISTS ingredients_name ON ingredients (name);
+        CREATE TABLE IF NOT EXISTS products (
+            position INTEGER PRIMARY KEY, name TEXT NOT NULL, price,
+            recipe TEXT, quantity);
+        CREATE INDEX IF NOT EXISTS products_name ON products (name);
+        CREATE TABLE IF NOT EXISTS orders (
+            position INTEGER PRIMARY KEY AUTOINCREMENT, order_id TEXT NOT NULL UNIQUE,
+            customer_name TEXT, items TEXT, total, status TEXT, timestamp TEXT, prices TEXT);
+        CREATE INDEX IF NOT EXISTS orders_status ON orders (status);
+        CREATE INDEX IF NOT EXISTS orders_timestamp ON orders (timestamp);
+        CREATE TABLE IF NOT EXISTS staff (
+            position INTEGER PRIMARY KEY, name TEXT, role TEXT, shifts TEXT);
+    """
+    journaled = False
+    shared = False
+    compact_due = False
+    journal_size = 0
+
+    def __init__(self, path=DATABASE_FILE):
+        self.path = path
+        # Connections may be handed to the write-behind thread; access is serialized by the caller
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=FULL")
+        self.conn.executescript(self.SCHEMA)
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(orders)")}
+
+        if "prices" not in columns:
+            # Databases created before line-item prices were recorded
+            self.conn.execute("ALTER TABLE orders ADD COLUMN prices TEXT")
+
+    def _to_row(self, collection, record):
+        return tuple(
+            json.dumps(record.get(field)) if field in self.JSON_FIELDS else record.get(field)
+            for field in self.FIELDS[collection]
+        )
+
+    def _from_row(self, collection, row):
+        return {
+            field: json.loads(value) if field in self.JSON_FIELDS and value is not None else value
+            for field, value in zip(self.FIELDS[collection], row)
+        }
+
+    def load(self, collection):
+        fields = ", ".join(self.FIELDS[collection])
+        rows = self.conn.execute(f"SELECT {fields} FROM {collection} ORDER BY position")
+        return [self._from_row(collection, row) for row in rows]
+
+    def load_recent_orders(self, since):
+        fields = ", ".join(self.FIELDS["orders"])
+        rows = self.conn.execute(
+            f"SELECT {fields} FROM orders WHERE status IS NOT 'Completed' OR timestamp IS NULL "
+            "OR timestamp >= ? ORDER BY position", (since,)
+        )
+        return [self._from_row("orders", row) for row in rows]
+
+    def last_order_id(self):
+        return self.conn.execute("SELECT MAX(order_id) FROM orders").fetchone()[0] or ""
+
+    def load_order_history(self, since):
+        fields = ", ".join(self.FIELDS["orders"])
+        rows = self.conn.execute(
+            f"SELECT {fields} FROM orders WHERE status = 'Completed' AND timestamp < ? ORDER BY position",
+            (since,)
+        )
+        return [self._from_row("orders", row) for row in rows]
+
+    def save(self, collection, records):
+        self.save_all({collection: records})
+
+    def save_all(self, collections):
+
+        with self.conn:
+            for collection, records in collections.items():
+                fields = self.FIELDS[collection]
+                placeholders = ", ".join("?" for _ in fields)
+                self.conn.execute(f"DELETE FROM {collection}")
+                self.conn.executemany(
+                    f"INSERT OR REPLACE INTO {collection} ({', '.join(fields)}) VALUES ({placeholders})",
+                    [self._to_row(collection, record) for record in records]
+                )
+
+    def apply_order_changes(self, changes):
+        fields = self.FIELDS["orders"]
+        updates = ", ".join(f"{field} = excluded.{field}" for field in fields[1:])
+        upsert = (
+            f"INSERT INTO orders ({', '.join(fields)}) VALUES ({', '.join('?' for _ in fields)}) "
+            f"ON CONFLICT (order_id) DO UPDATE SET {updates}"
+        )
+
+        with self.conn:
+            for op, value in changes:
+
+                if op == "put":
+                    self.conn.execute(upsert, self._to_row("orders", value))
+                else:
+                    self.conn.execute("DELETE FROM orders WHERE order_id = ?", (value,))
+
+    def put_orders(self, records):
+        self.apply_order_changes([("put", record) for record in records])
+
+    def delete_order(self, order_id):
+        self.apply_order_changes([("delete", order_id)])
+
+    def compact_journal(self, since=None):
+        return False  # orders are updated in place and history is filtered by an index
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.conn.close()
+
+class WriteBehindStorage:
+    """Queues writes for a storage engine and flushes them on a background thread once writes
+    pause for `delay` seconds, and at most `max_staleness` seconds after the first queued one.
+
+    A failed background flush leaves the writes queued and is retried; `error` holds the
+    exception until a flush succeeds, and on_error, if set, is called on the write-behind thread
+    with the exception when flushing starts failing and with None once it works again.
+    """
+
+    shared = False
+
+    def __init__(self, storage, delay=0.5, max_staleness=2.0):
+        self.storage = storage
+        self.delay = delay
+        self.max_staleness = max_staleness
+        self.journaled = storage.journaled
+        self.error = None
+        self.on_error = None
+        self._snapshots = {}
+        self._order_changes = []
+        self._first_write = None
+        self._deadline = None
+        self._closed = False
+        self._state = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+        self._thread.start()
+
+    def load(self, collection):
+        self.flush()
+        return self.storage.load(collection)
+
+    def load_recent_orders(self, since):
+        self.flush()
+        return self.storage.load_recent_orders(since)
+
+    def load_order_history(self, since):
+        self.flush()
+        return self.storage.load_order_history(since)
+
+    def last_order_id(self):
+        self.flush()
+        return self.storage.last_order_id()
+
+    @property
+    def journal_size(self):
+
+        if not self.journaled:
+            return 0
+
+        if "orders" in self._snapshots:
+            return len(self._order_changes)
+        return self.storage.journal_size + len(self._order_changes)
+
+    @property
+    def compact_due(self):
+        return self.journal_size >= JOURNAL_COMPACT_THRESHOLD
+
+    def _schedule(self):
+        now = time.monotonic()
+
+        if self._first_write is None:
+            self._first_write = now
+        self._deadline = min(now + self.delay, self._first_write + self.max_staleness)
+        self._state.notify()
+
+    def save(self, collection, records):
+        self.save_all({collection: records})
+
+    def save_all(self, collections):
+
+        with self._state:
+            self._snapshots.update(collections)
+
+            if "orders" in collections:
+                self._order_changes.clear()  # the snapshot already contains them
+            self._schedule()
+
+    def apply_order_changes(self, changes):
+
+        with self._state:
+            self._order_changes.extend(changes)
+            self._schedule()
+
+    def put_orders(self, records):
+        self.apply_order_changes([("put", record) for record in records])
+
+    def delete_order(self, order_id):
+        self.apply_order_changes([("delete", order_id)])
+
+    def compact_journal(self, since=None):
+        self.flush()
+        return self.storage.compact_journal(since)
+
+    def _run(self):
+
+        while True:
+
+            with self._state:
+
+                while not self._closed and (self._deadline is None or time.monotonic() < self._deadline):
+                    timeout = None if self._deadline is None else self._deadline - time.monotonic()
+                    self._state.wait(timeout)
+
+                if self._closed:
+                    return
+
+            failing = self.error is not None
+
+            try:
+                self.flush()
+
+            except Exception as e:
+                self.error = e
+
+                with self._state:
+                    # Back off instead of spinning; the pending writes stay queued for the next attempt
+                    self._first_write = time.monotonic()
+                    self._deadline = self._first_write + self.max_staleness
+
+                if not failing and self.on_error:
+                    self.on_error(e)
+            else:
+
+                if failing and self.on_error:
+                    self.on_error(None)
+
+    def flush(self):
+        """Write everything queued so far; raises if the writes fail (they stay queued)"""
+
+        with self._flush_lock:
+
+            with self._state:
+                snapshots, self._snapshots = self._snapshots, {}
+                changes, self._order_changes = self._order_changes, []
+                self._first_write = self._deadline = None
+
+            try:
+
+                if snapshots:
+                    self.storage.save_all(snapshots)
+                    snapshots = {}
+
+                if changes:
+                    self.storage.apply_order_changes(changes)
+
+            except Exception:
+
+                with self._state:
+
+                    if "orders" in self._snapshots:
+                        changes = []
+                    self._snapshots = dict(snapshots, **self._snapshots)
+                    self._order_changes = changes + self._order_changes
+
+                    if self._first_write is None:
+                        self._first_write = time.monotonic()
+                        self._deadline = self._first_write + self.max_staleness
+                raise
+            self.error = None
+
+    def close(self):
+
+        with self._state:
+            self._closed = True
+            self._state.notify()
+        self._thread.join()
+        self.flush()
+        self.storage.close()
+
+def migrate_json_to_sqlite(path=DATABASE_FILE, source=None):
+    """Copy every collection from the JSON files (journal included) into a new SQLite database"""
+    source = source or JsonStorage()
+    staging_path = path + ".tmp"
+
+    if os.path.exists(staging_path):
+        os.remove(staging_path)
+    staging = SqliteStorage(staging_path)
+    staging.save_all({collection: source.load(collection) for collection in COLLECTIONS})
+    staging.close()
+    os.replace(staging_path, path)
+    return SqliteStorage(path)
+
+def open_storage(config_file=CONFIG_FILE):
+    """Build the storage engine named in the [Storage] section of config.ini (JSON by default)"""
+    config = configparser.ConfigParser()
+    config.read(config_file)
+    section = config["Storage"] if "Storage" in config else {}
+    shared = section.get("shared", "no").lower() in ("1", "yes", "true", "on")
+    delay = float(section.get("write_behind", 0))
+
+    if shared and (section.get("backend", "json") != "json" or delay > 0):
+        raise StorageError("shared = yes needs the json backend without write_behind")
+
+    if section.get("backend", "json") == "sqlite":
+        path = section.get("database", DATABASE_FILE)
+
+        if not os.path.exists(path):
+            storage = migrate_json_to_sqlite(path)
+        else:
+            storage = SqliteStorage(path)
+    else:
+        storage = JsonStorage(codec=get_codec(section.get("codec", "json")), shared=shared)
+
+    if delay > 0:
+        storage = WriteBehindStorage(storage, delay, float(section.get("max_staleness", 2.0)))
+    return storage
+
+if __name__ == "__main__":
+    import argparse  # only the command line needs it; keeps `import storage` light for headless use
+    parser = argparse.ArgumentParser(description="Bakery data storage tools")
+    parser.add_argument("command", choices=["migrate"])
+    parser.add_argument("--database", default=DATABASE_FILE)
+    args = parser.parse_args()
+    migrate_json_to_sqlite(args.database).close()
+    print(f"Migrated JSON data into {args.database}")